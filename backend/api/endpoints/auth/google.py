@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Request
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from models.auth import TokenIn, TokenOut, UserData, RefreshTokenRequest
 from services.auth.google import verify_google_token
@@ -11,26 +11,35 @@ from services.auth.jwt import (
 from services.database.psql import (
     insert_or_get_user,
     get_user_by_sub,
-    upsert_refresh_token_for_user,
-    get_user_by_refresh_token,
-    delete_refresh_token,
+    create_refresh_session,
+    rotate_refresh_session,
+    delete_refresh_session,
 )
-from datetime import datetime
 
 router = APIRouter(tags=["auth"])
 
 # Security scheme for extracting and validating Bearer tokens
 bearer_scheme = HTTPBearer()
 
+# Maximum stored length of the device description (refresh_sessions.device)
+DEVICE_MAX_LENGTH = 255
+
+
+def get_device(request: Request) -> str:
+    """
+    Describes the client of a refresh session by its User-Agent.
+    """
+    return request.headers.get("user-agent", "")[:DEVICE_MAX_LENGTH]
+
 
 @router.post("/google", response_model=TokenOut)
-async def login_google(payload: TokenIn):
+async def login_google(payload: TokenIn, request: Request):
     """
     Logs in a user via Google OAuth2 token.
 
     - Verifies the Google token.
     - Fetches or inserts the user in the database.
-    - Issues JWT access and refresh tokens.
+    - Issues JWT access and refresh tokens; the refresh token starts a new session for this device.
     """
     user_info = verify_google_token(payload.token)
 
@@ -50,10 +59,11 @@ async def login_google(payload: TokenIn):
     refresh_token = create_refresh_token()
     expires_at = get_refresh_token_expiry()
 
-    await upsert_refresh_token_for_user(
+    await create_refresh_session(
         sub=user_info["sub"],
         refresh_token=refresh_token,
-        expires_at=expires_at
+        expires_at=expires_at,
+        device=get_device(request)
     )
 
     return TokenOut(access_token=token, refresh_token=refresh_token)
@@ -90,36 +100,23 @@ async def refresh_access_token(payload: RefreshTokenRequest = Body(...)):
     Refreshes the access token using a valid refresh token.
 
     - Verifies and validates the refresh token.
-    - Issues new access and refresh tokens.
+    - Issues new access and refresh tokens; the old session is replaced (token rotation).
     """
     refresh_token = payload.refresh_token
 
     try:
-        db_user = await get_user_by_refresh_token(refresh_token)
-        if not db_user:
-            raise HTTPException(status_code=401, detail="Invalid refresh token")
-
-        expires_at = db_user.get("refresh_token_expires_at")
-        if not expires_at or expires_at < datetime.utcnow():
-            raise HTTPException(status_code=401, detail="Refresh token expired")
-
-        user_data_for_token = await get_user_by_sub(db_user["sub"])
-        if not user_data_for_token:
-            raise HTTPException(status_code=404, detail="User not found for refresh token")
-
-        new_access_token = create_jwt_token(
-            sub=db_user["sub"],
-            name=user_data_for_token.get("name"),
-            email=user_data_for_token.get("email")
-        )
-
         new_refresh_token = create_refresh_token()
         new_expires_at = get_refresh_token_expiry()
 
-        await upsert_refresh_token_for_user(
-            sub=db_user["sub"],
-            refresh_token=new_refresh_token,
-            expires_at=new_expires_at
+        # One statement validates the old token and swaps in the new one; a token can be used only once
+        user = await rotate_refresh_session(refresh_token, new_refresh_token, new_expires_at)
+        if not user:
+            raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+        new_access_token = create_jwt_token(
+            sub=user["sub"],
+            name=user.get("name"),
+            email=user.get("email")
         )
 
         return TokenOut(access_token=new_access_token, refresh_token=new_refresh_token)
@@ -137,11 +134,9 @@ async def logout(refresh_token: str = Body(..., embed=True)):
     """
     Logs out the user by invalidating the provided refresh token.
 
-    - Deletes the refresh token record from the database.
+    - Deletes the refresh session of this token; other devices stay logged in.
     """
-    token_record = await get_user_by_refresh_token(refresh_token)
-    if not token_record:
+    if not await delete_refresh_session(refresh_token):
         raise HTTPException(status_code=400, detail="Invalid refresh token")
 
-    await delete_refresh_token(refresh_token)
     return {"message": "Successfully logged out"}
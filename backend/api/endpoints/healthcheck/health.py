@@ -1,7 +1,33 @@
-from fastapi import APIRouter
+import hmac
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request
+from services.database.psql import get_db_metrics
+
+# Token required by the internal metrics endpoints (X-Metrics-Token header).
+# Without it, only requests from the local host are allowed.
+METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+
+LOOPBACK_ADDRESSES = ("127.0.0.1", "::1")
 
 router = APIRouter(tags=["health"])
 
+
+def require_internal_caller(request: Request):
+    """
+    Dependency restricting an endpoint to internal callers: a matching X-Metrics-Token header,
+    or, if METRICS_TOKEN is not configured, a request from the local host.
+
+    Raises:
+        HTTPException: 403 for any other caller.
+    """
+    if METRICS_TOKEN:
+        token = request.headers.get("x-metrics-token", "")
+        if hmac.compare_digest(token.encode("utf-8"), METRICS_TOKEN.encode("utf-8")):
+            return
+    elif request.client is not None and request.client.host in LOOPBACK_ADDRESSES:
+        return
+    raise HTTPException(status_code=403, detail="Forbidden")
+
 @router.get("/health")
 async def health():
     """
@@ -9,6 +35,17 @@ async def health():
     """
     return {"message": "running."}
 
+@router.get("/health/db", dependencies=[Depends(require_internal_caller)])
+async def health_db():
+    """
+    Returns DAO instrumentation for this worker: per-operation call counts, errors, rows,
+    latency histograms (whole call, query, pool acquire wait) and pool gauges.
+    Comparing acquire_wait with query latency tells pool starvation apart from slow SQL.
+
+    Internal only: requires the X-Metrics-Token header (or a local caller when no token is configured).
+    """
+    return get_db_metrics()
+
 # Note:
 # To run this FastAPI application:
 # - Save the relevant code to 'main.py' and supporting modules accordingly.
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 from typing import List
-from services.database.psql import get_all_card_data
+from services.catalog.payloads import card_payloads
+from services.catalog.translations import translation_index
 from models.card import CardData
+from utils.http_cache import make_etag, etag_matches, catalog_cache_headers, not_modified
 
 router = APIRouter(tags=["cards"])
 
 @router.get("/all_cards", response_model=List[CardData])
-async def get_all_cards(lang: str = Query("hu", description="Language code, e.g. 'hu' or 'en'")) -> List[CardData]:
+async def get_all_cards(request: Request, lang: str = Query("hu", description="Language code, e.g. 'hu' or 'en'")) -> Response:
     """
-    Returns all card data for the specified language from the database.
+    Returns all card data for the specified language.
+
+    The JSON body is pre-rendered (with gzip and brotli variants) whenever the card
+    catalog changes, so a request only selects the variant matching Accept-Encoding.
+    Responses carry a strong ETag per catalog version, language and encoding;
+    a matching If-None-Match is answered with 304.
+    The payloads never touch the database, so they are still served while it is down,
+    marked with an X-Catalog-Stale header.
 
     Args:
         lang (str): Language code to filter the card descriptions by (default is 'hu').
@@ -16,6 +25,19 @@ async def get_all_cards(lang: str = Query("hu", description="Language code, e.g.
     Returns:
         List[CardData]: List of card descriptions for the requested language.
     """
-    all_data: List[CardData] = await get_all_card_data(lang=lang)
-    return all_data
+    payload = await card_payloads.get(lang)
+    body, encoding = payload.select(request.headers.get("accept-encoding", ""))
+
+    headers = catalog_cache_headers(
+        make_etag(card_payloads.version, lang, encoding or "identity"),
+        translation_index.snapshot.loaded_at,
+        stale=translation_index.is_stale,
+    )
+    headers["Vary"] = "Accept-Encoding"
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
 
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,19 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from typing import Optional
-from services.database.psql import get_card_data_by_key_and_lang
+from services.catalog.translations import translation_index
 from models.card import CardDescription
+from utils.http_cache import make_etag, etag_matches, catalog_cache_headers, not_modified
 
 router = APIRouter(tags=["cards"])
 
 @router.get("/card_description/{key}", response_model=CardDescription)
-async def get_card_description(key: str, lang: Optional[str] = Query("hu", max_length=10)) -> CardDescription:
+async def get_card_description(
+    key: str,
+    request: Request,
+    response: Response,
+    lang: Optional[str] = Query("hu", max_length=10),
+) -> CardDescription:
     """
-    Retrieves the name and description for a specific card from the database using its unique key and language.
-    If the requested language translation is not found, falls back to Hungarian.
+    Retrieves the name and description for a specific card from the in-memory translation index
+    using its unique key and language. If the requested language translation is not found,
+    the language's fallback chain is followed (Hungarian by default).
+
+    Responses carry a strong ETag derived from the catalog version; a matching
+    If-None-Match is answered with 304 without looking up the card.
+    While the database is unavailable the last loaded snapshot is served, marked with an
+    X-Catalog-Stale header.
     """
-    card_data = await get_card_data_by_key_and_lang(key, lang)
+    snapshot = translation_index.snapshot
+    headers = catalog_cache_headers(
+        make_etag(snapshot.version, key, lang),
+        snapshot.loaded_at,
+        stale=translation_index.is_stale,
+    )
+
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return not_modified(headers)
+
+    card_data = translation_index.lookup(key, lang)
 
     if not card_data or "description" not in card_data or "name" not in card_data:
         raise HTTPException(status_code=404, detail=f"Card data not found for key: {key} and lang: {lang}")
 
-    return CardDescription(name=card_data["name"], description=card_data["description"])
\ No newline at end of file
+    response.headers.update(headers)
+    return CardDescription(name=card_data["name"], description=card_data["description"])
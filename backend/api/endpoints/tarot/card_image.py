@@ -0,0 +1,88 @@
+import os
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional
+from services.catalog.card_catalog import card_catalog, CatalogCard
+from services.storage.base import ObjectNotFoundError
+from services.storage.disk_cache import card_image_cache
+from services.storage.factory import get_storage
+from utils.file_response import ZeroCopyFileResponse
+from utils.http_cache import etag_matches, not_modified
+
+# Cache-Control sent with card images; the URL of an image does not change when the image is replaced,
+# so clients revalidate with If-None-Match after max-age
+CARD_IMAGE_CACHE_CONTROL: str = os.getenv("CARD_IMAGE_CACHE_CONTROL", "public, max-age=86400")
+
+router = APIRouter(tags=["cards"])
+
+
+def select_object_name(card: CatalogCard, width: Optional[int], image_format: Optional[str]) -> str:
+    """
+    Picks the object to serve: the smallest variant at least 'width' pixels wide in the
+    requested format (WebP by default), the widest one if none is wide enough, or the
+    full-size image if no width or format is requested or the card has no such variants.
+    """
+    if width is None and image_format is None:
+        return card.object_name
+    candidates = [v for v in card.variants if v.format == (image_format or "webp")]
+    if not candidates:
+        return card.object_name
+    if width is None:
+        return candidates[-1].object_name
+    return next((v for v in candidates if v.width >= width), candidates[-1]).object_name
+
+
+@router.get("/card_image/{key}")
+async def get_card_image(
+    key: str,
+    request: Request,
+    width: Optional[int] = Query(None, gt=0, le=4096, description="Smallest acceptable width in pixels"),
+    format: Optional[str] = Query(None, pattern="^(webp|avif)$", description="Variant format"),
+) -> Response:
+    """
+    Serves a card image. With the local-filesystem backend the file is served from the storage
+    directory; otherwise from the local disk cache, which downloads it from the backend on a miss.
+
+    The object is streamed to disk in chunks and never held in memory. Responses carry the
+    object's ETag: a matching If-None-Match is answered with 304, and Range requests get 206
+    partial content. Files are sent with sendfile only if the ASGI server offers the zero-copy
+    send extension; uvicorn does not, so there they are read in chunks on a worker thread.
+    A cached file stays pinned until its response is finished, so eviction cannot remove it mid-request.
+
+    Args:
+        key (str): Card key (e.g., "fool").
+        width (Optional[int]): Selects the narrowest resized variant at least this wide.
+        format (Optional[str]): Variant format, "webp" (default) or "avif".
+    """
+    card = card_catalog.get(key.lower())
+    if card is None:
+        raise HTTPException(status_code=404, detail=f"Card image not found for key: {key}")
+
+    object_name = select_object_name(card, width, format)
+    storage = get_storage()
+    image = None
+    try:
+        path = storage.local_path(object_name)
+        if path is not None:
+            stored = await storage.stat_object(object_name)
+            etag, content_type = stored.etag, stored.content_type
+        else:
+            image = await card_image_cache.acquire(object_name)
+            path, etag, content_type = image.path, image.etag, image.content_type
+    except ObjectNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Card image not found for key: {key}")
+    except Exception as e:
+        print(f"Error fetching card image '{object_name}': {e}")
+        raise HTTPException(status_code=503, detail="Card image storage unavailable")
+
+    headers = {
+        "ETag": f'"{etag}"',
+        "Cache-Control": CARD_IMAGE_CACHE_CONTROL,
+    }
+    release = (lambda: card_image_cache.release(image)) if image is not None else None
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        if release is not None:
+            release()
+        return not_modified(headers)
+
+    # FileResponse answers Range/If-Range itself and adds Content-Length, Last-Modified and Accept-Ranges
+    return ZeroCopyFileResponse(path, on_close=release, media_type=content_type, headers=headers)
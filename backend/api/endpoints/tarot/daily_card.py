@@ -1,30 +1,80 @@
-import random
+import asyncio
 import os
 import traceback
-from datetime import datetime, timezone
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Depends, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from models.card import Card
+from typing import List, Optional
+from models.card import Card, CardImageVariant
 from services.auth.jwt import decode_jwt_token
-from services.storage.minio import client, BUCKET_NAME
-from services.database.psql import (
-    get_user_by_sub,
-    update_user_draw_date,
-    get_card_data_by_key_and_lang
-)
-from utils.formatters import format_card_name
+from services.storage.factory import get_storage
+from services.storage.presign_cache import presigned_urls
+from services.catalog.card_catalog import card_catalog, CatalogCard
+from services.catalog.translations import translation_index
+from services.database.psql import claim_daily_draw
+from services.database.draw_history import draw_history
 
 # Load configuration from environment variables
-MINIO_EXTERNAL = os.getenv("MINIO_PUBLIC_URL", "http://localhost:9000")
 USE_PRESIGNED_URL = os.getenv("USE_PRESIGNED_URL", "false").lower() == "true"
 
+# "random": a random card once per day, repeat requests get 403.
+# "deterministic": the card is derived from a keyed hash of (user, UTC date), so repeat
+# requests on the same day return the same card again.
+DAILY_DRAW_MODE = os.getenv("DAILY_DRAW_MODE", "random").lower()
+
 # Use HTTPBearer security scheme for Swagger UI integration
 bearer_scheme = HTTPBearer()
 
 router = APIRouter(tags=["cards"])
 
+
+def seconds_until_next_utc_midnight(now: datetime) -> int:
+    """
+    Returns the number of whole seconds from 'now' (UTC) until the next UTC midnight.
+    """
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return max(int((next_midnight - now).total_seconds()), 0)
+
+
+def uses_presigned_urls() -> bool:
+    """
+    Returns True if image URLs are presigned; never for a storage backend that does not publish
+    its objects, whose images are loaded through the image endpoint.
+    """
+    return USE_PRESIGNED_URL and get_storage().has_public_urls()
+
+
+async def image_url(object_name: str, public_url: str) -> str:
+    """
+    Returns the URL the client should load an image from: presigned or public, depending on config.
+    """
+    if uses_presigned_urls():
+        return await presigned_urls.get_url(object_name)
+    return public_url
+
+
+async def image_variants(card: CatalogCard) -> List[CardImageVariant]:
+    """
+    Returns the card's resized renditions with their URLs, smallest first.
+    """
+    urls = await asyncio.gather(*(image_url(v.object_name, v.public_url) for v in card.variants))
+    return [
+        CardImageVariant(url=url, width=v.width, height=v.height, format=v.format)
+        for v, url in zip(card.variants, urls)
+    ]
+
+
+def build_srcset(variants: List[CardImageVariant], image_format: str = "webp") -> Optional[str]:
+    """
+    Builds an <img srcset> value from the variants of one format, or None if there are none.
+    """
+    candidates = [f"{v.url} {v.width}w" for v in variants if v.format == image_format]
+    return ", ".join(candidates) or None
+
+
 @router.get("/daily_card", response_model=Card)
 async def get_daily_card(
+    response: Response,
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ) -> Card:
     """
@@ -34,6 +84,9 @@ async def get_daily_card(
     Args:
         credentials (HTTPAuthorizationCredentials): Contains the Authorization header credentials.
 
+    In deterministic draw mode a repeated request on the same UTC day returns the same card
+    instead of 403, and the response may be cached privately until the next UTC midnight.
+
     Returns:
         Card: The daily card data including name, image URL, key, and description.
 
@@ -54,59 +107,71 @@ async def get_daily_card(
     if not user_sub:
         raise HTTPException(status_code=400, detail="Missing user identifier in token.")
 
-    # Fetch the user from the database by 'sub'
-    user = await get_user_by_sub(user_sub)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found.")
-
-    # Check if the user has already drawn a card today (rate limiting)
-    last_draw = user.get("last_draw_date")
-    today = datetime.now(timezone.utc).date()
-    if last_draw == today:
-        raise HTTPException(status_code=403, detail="You have already drawn a card today.")
-
-    try:
-        # List all objects in the MinIO bucket and filter webp files
-        objects = list(client.list_objects(BUCKET_NAME, recursive=True))
-        webp_files = [obj.object_name for obj in objects if obj.object_name.lower().endswith(".webp")]
-
-        if not webp_files:
-            raise HTTPException(status_code=404, detail="No webp files found in MinIO bucket.")
-
-        # Select a random card image from the available webp files
-        selected = random.choice(webp_files)
+    if not card_catalog.is_loaded:
+        raise HTTPException(status_code=503, detail="Card catalog is not available yet.")
 
-        # Generate accessible image URL depending on config
-        if USE_PRESIGNED_URL:
-            image_url = client.presigned_get_object(BUCKET_NAME, selected)
-        else:
-            image_url = f"{MINIO_EXTERNAL}/{BUCKET_NAME}/{selected}"
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    deterministic = DAILY_DRAW_MODE == "deterministic"
 
-        # Format card name and extract key from filename
-        name = format_card_name(selected)
-        key = selected.rsplit("/", 1)[-1].split(".")[0].lower()
-
-        # Get user's preferred language or fallback to Hungarian ('hu')
-        user_lang = user.get("lang", "hu")
-
-        # Retrieve card description in user's language
-        card_data = await get_card_data_by_key_and_lang(key, user_lang)
-        if card_data:
-            name = card_data.get("name", format_card_name(selected))
-            description = card_data.get("description", "No description available.")
-        else:
-            name = format_card_name(selected)
-            description = "No description available."
-
-        # Update the user's last draw date to today
-        await update_user_draw_date(user_sub)
-
-        # Return the card data as response
-        return Card(name=name, image_url=image_url, key=key, description=description)
+    # Select the card from the in-memory deck (no storage round trip)
+    if deterministic:
+        card = card_catalog.card_for_user_and_day(user_sub, today)
+    else:
+        card = card_catalog.random_card()
+    if not card:
+        raise HTTPException(status_code=404, detail="No webp files found in MinIO bucket.")
 
+    try:
+        # Generate accessible image URLs (full size and responsive variants) depending on config.
+        # They are resolved before the draw is claimed, so a storage error does not use up the day's draw.
+        full_size_url = await image_url(card.object_name, card.public_url)
+        variants = await image_variants(card)
     except Exception as e:
         # Log the full traceback for debugging
         print("ERROR TRACEBACK:")
         print(traceback.format_exc())
         # Return generic internal server error to client
         raise HTTPException(status_code=500, detail=f"Unexpected error occurred: {str(e)}")
+
+    # Claim today's draw in one query; it only succeeds once per UTC day, even for concurrent requests.
+    draw = await claim_daily_draw(user_sub, today)
+    if not draw:
+        raise HTTPException(status_code=404, detail="User not found.")
+
+    if not draw["claimed"] and not deterministic:
+        raise HTTPException(status_code=403, detail="You have already drawn a card today.")
+
+    # Look up the card text in the user's language from the in-memory index
+    card_data = translation_index.lookup(card.key, draw["lang"] or "hu")
+    if card_data:
+        name = card_data["name"]
+        description = card_data["description"]
+    else:
+        name = card.display_name
+        description = "No description available."
+
+    if deterministic:
+        # The answer does not change until the next UTC day; let the client cache it,
+        # but never longer than the image URL stays valid.
+        max_age = seconds_until_next_utc_midnight(now)
+        if uses_presigned_urls():
+            max_age = min(max_age, int(presigned_urls.min_remaining_seconds))
+        response.headers["Cache-Control"] = f"private, max-age={max_age}"
+        response.headers["Vary"] = "Authorization"
+
+    daily_card = Card(
+        name=name,
+        image_url=full_size_url,
+        key=card.key,
+        description=description,
+        variants=variants,
+        srcset=build_srcset(variants),
+    )
+
+    if draw["claimed"]:
+        # Record the draw in the history table asynchronously (write-behind), once the response is built
+        await draw_history.record(draw["id"], card.key, today)
+
+    # Return the card data as response
+    return daily_card
@@ -2,6 +2,31 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import logging
 from services.database.psql import connect_to_db, close_db_connection
+from services.database.draw_history import draw_history
+from services.database.partitions import partition_maintenance
+from services.database.maintenance import refresh_session_purge
+from services.catalog.card_catalog import card_catalog
+from services.catalog.translations import translation_index
+from services.catalog.payloads import card_payloads
+from services.database.notifications import CatalogChangeListener
+from services.storage.factory import get_storage
+from services.storage.disk_cache import card_image_cache
+
+
+async def reload_catalog_caches(read_only: bool = False):
+    """
+    Reloads the translation index and re-renders the /all_cards payloads.
+    Both are no-ops when the catalog content did not change.
+
+    The startup load may use the read replica; reloads triggered by a change notification
+    read from the primary, since the replica may not have applied the change yet.
+    """
+    await translation_index.reload(read_only=read_only)
+    await card_payloads.rebuild()
+
+
+# Invalidates the in-process catalog caches when the seeding tools change the catalog tables
+catalog_listener = CatalogChangeListener(on_change=reload_catalog_caches)
 
 # Lifespan event handler: Handles the lifecycle of the application.
 # Specifically manages the database connection pool during startup and shutdown.
@@ -17,11 +42,45 @@ async def lifespan(app: FastAPI):
     # Initialize the database connection pool.
     # If the connection fails, an exception is raised and the application will not start.
     await connect_to_db()
+
+    # Make sure 'daily_card' has partitions for the coming months; retire expired ones periodically.
+    await partition_maintenance.start()
+
+    # Delete expired refresh sessions now and periodically; every login adds a row.
+    await refresh_session_purge.start()
+
+    # Start the write-behind queue that records draws in the 'daily_card' table.
+    draw_history.start()
+
+    # Load all card translations into memory and pre-render the /all_cards payloads;
+    # card text lookups never hit the database.
+    await reload_catalog_caches(read_only=True)
+
+    # Reload the caches above whenever 'cards' or 'card_translations' change (LISTEN/NOTIFY).
+    await catalog_listener.start()
+
+    # Load the card deck into memory and keep it refreshed in the background.
+    await card_catalog.start()
+
+    # Local disk cache behind /api/card_image.
+    card_image_cache.start()
     print("Application startup tasks finished.")
 
     yield  # The application runs while paused here. Control is returned to FastAPI to process requests.
 
     # --- Shutdown ---
+    await catalog_listener.stop()
+    await card_catalog.stop()
+    await partition_maintenance.stop()
+    await refresh_session_purge.stop()
+
+    # Flush pending draw history while the pool is still open.
+    await draw_history.stop()
+
     # Clean up the database connection pool upon application shutdown.
     await close_db_connection()
+
+    # Stop the storage worker threads.
+    get_storage().shutdown()
+    card_image_cache.stop()
     print("Application shutdown tasks finished.")
@@ -5,6 +5,7 @@ from core.exceptions import setup_exception_handlers
 from api.endpoints.tarot.daily_card import router as daily_card_router
 from api.endpoints.tarot.card_description import router as card_description_router
 from api.endpoints.tarot.all_cards import router as all_cards_router
+from api.endpoints.tarot.card_image import router as card_image_router
 from api.endpoints.healthcheck.health import router as healthcheck_router
 from api.endpoints.auth.google import router as google_auth_router
 
@@ -23,6 +24,7 @@ setup_rate_limiter(app)
 app.include_router(daily_card_router, prefix="/api")
 app.include_router(card_description_router, prefix="/api")
 app.include_router(all_cards_router, prefix="/api")
+app.include_router(card_image_router, prefix="/api")
 app.include_router(healthcheck_router, prefix="/api")
 app.include_router(google_auth_router, prefix="/api/auth")
 
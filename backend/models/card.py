@@ -1,7 +1,24 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 # Pydantic Models: Define the structure and validation logic for API request and response payloads.
 
+class CardImageVariant(BaseModel):
+    """
+    A resized rendition of a card image, for responsive images (srcset / <picture>).
+
+    Attributes:
+    - url (str): URL of the image.
+    - width (int): Width in pixels.
+    - height (int): Height in pixels.
+    - format (str): Image format, e.g. "webp" or "avif".
+    """
+    url: str
+    width: int
+    height: int
+    format: str
+
+
 class Card(BaseModel):
     """
     Represents a Tarot card with its core metadata.
@@ -14,11 +31,15 @@ class Card(BaseModel):
     - image_url (str): Relative or absolute URL pointing to the card image.
     - key (str): Unique string identifier for the card, often derived from its filename.
     - description (str): Full, default-language description or meaning of the card.
+    - variants (List[CardImageVariant]): Resized renditions in several widths and formats (may be empty).
+    - srcset (Optional[str]): WebP variants as an <img srcset> value (e.g., "url 320w, url 640w").
     """
     name: str
     image_url: str
     key: str
     description: str
+    variants: List[CardImageVariant] = []
+    srcset: Optional[str] = None
 
 
 class CardDescription(BaseModel):
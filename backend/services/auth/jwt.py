@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt  # PyJWT library for encoding and decoding JWTs
+import hashlib
 import os
 import secrets
 
@@ -73,6 +74,18 @@ def create_refresh_token() -> str:
     """
     return secrets.token_urlsafe(48)
 
+def hash_refresh_token(refresh_token: str) -> bytes:
+    """
+    Hashes a refresh token for storage and lookup.
+
+    Refresh tokens are high-entropy random strings, so a single fast SHA-256 is enough;
+    a leaked database does not reveal usable tokens.
+
+    Returns:
+        bytes: The 32-byte SHA-256 digest of the token.
+    """
+    return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
 def get_refresh_token_expiry() -> datetime:
     """
     Calculates the expiration datetime for the refresh token.
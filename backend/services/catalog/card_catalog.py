@@ -0,0 +1,340 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field, replace
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from services.storage.factory import get_storage
+from utils.formatters import format_card_name
+
+# When set (e.g., "https://example.com/api/card_image"), image links point to the backend's
+# /api/card_image endpoint instead of MinIO, so clients never need to reach MinIO directly
+CARD_IMAGE_BASE_URL: str = os.getenv("CARD_IMAGE_BASE_URL", "").rstrip("/")
+
+# Path of the image endpoint, used for image links when CARD_IMAGE_BASE_URL is unset and the
+# storage backend does not publish its objects (local backend without STORAGE_LOCAL_PUBLIC_URL)
+CARD_IMAGE_ENDPOINT_PATH: str = "/api/card_image"
+
+# How often (in seconds) the deck is re-read from the bucket in the background
+CARD_CATALOG_REFRESH_SECONDS: float = float(os.getenv("CARD_CATALOG_REFRESH_SECONDS", "300"))
+
+# Key for the deterministic daily draw hash; falls back to the JWT secret
+DAILY_DRAW_SECRET: str = os.getenv("DAILY_DRAW_SECRET") or os.getenv("JWT_SECRET_KEY", "test")
+
+# Only objects with this extension are treated as card faces
+CARD_IMAGE_EXTENSION: str = ".webp"
+
+# Responsive image variants built by helper_scripts/build_card_variants.py.
+# Objects below this prefix are not card faces; the manifest lists the variants per card.
+CARD_VARIANTS_PREFIX: str = os.getenv("CARD_VARIANTS_PREFIX", "variants/")
+CARD_VARIANTS_MANIFEST: str = f"{CARD_VARIANTS_PREFIX}manifest.json"
+
+# Content-addressed copies published by helper_scripts/sync_cards_to_minio.py.
+# The manifest maps plain object names to hashed ones; public URLs use the hashed names,
+# which never change content and can be cached as immutable.
+CARD_HASHED_PREFIX: str = os.getenv("CARD_HASHED_PREFIX", "hashed/")
+CARD_HASHED_MANIFEST: str = f"{CARD_HASHED_PREFIX}manifest.json"
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    """
+    A resized rendition of a card face.
+
+    Attributes:
+    - object_name (str): Object name inside the bucket (e.g., "variants/fool/640.webp").
+    - width (int): Width in pixels.
+    - height (int): Height in pixels.
+    - format (str): Image format ("webp" or "avif").
+    - public_url (str): Direct (non-presigned) URL of the image.
+    """
+    object_name: str
+    width: int
+    height: int
+    format: str
+    public_url: str
+
+
+@dataclass(frozen=True)
+class CatalogCard:
+    """
+    A single card face available in the storage bucket.
+
+    Attributes:
+    - object_name (str): Object name inside the bucket (e.g., "fool.webp").
+    - key (str): Card key derived from the filename, used for DB lookups.
+    - display_name (str): Fallback human-readable name derived from the filename.
+    - public_url (str): Direct (non-presigned) URL of the image.
+    - variants (Tuple[ImageVariant, ...]): Resized renditions, smallest first (may be empty).
+    """
+    object_name: str
+    key: str
+    display_name: str
+    public_url: str
+    variants: Tuple[ImageVariant, ...] = ()
+
+
+@dataclass(frozen=True)
+class DeckSnapshot:
+    """
+    Immutable view of the deck at one point in time.
+
+    A new snapshot is built on every refresh and swapped in with a single assignment,
+    so readers never observe a partially updated deck.
+    """
+    version: int
+    loaded_at: float
+    cards: Tuple[CatalogCard, ...] = ()
+    by_key: Dict[str, CatalogCard] = field(default_factory=dict)
+
+
+def card_key_from_object_name(object_name: str) -> str:
+    """
+    Derives the card key from an object name (e.g., "decks/Fool.webp" -> "fool").
+    """
+    return object_name.rsplit("/", 1)[-1].split(".")[0].lower()
+
+
+def build_public_url(object_name: str) -> str:
+    """
+    Builds the direct public URL of an object in the tarot bucket (or its local equivalent).
+    """
+    return get_storage().public_url(object_name)
+
+
+def image_endpoint_url() -> str:
+    """
+    Returns the base URL of the backend image endpoint card URLs point at: CARD_IMAGE_BASE_URL,
+    or CARD_IMAGE_ENDPOINT_PATH if the storage backend does not publish its objects; empty if
+    card URLs are public storage URLs.
+    """
+    if CARD_IMAGE_BASE_URL:
+        return CARD_IMAGE_BASE_URL
+    return "" if get_storage().has_public_urls() else CARD_IMAGE_ENDPOINT_PATH
+
+
+def build_image_url(object_name: str, key: str, query: str = "", hashed_name: Optional[str] = None) -> str:
+    """
+    Builds the non-presigned URL of a card image: the backend image endpoint (see
+    image_endpoint_url) if used, otherwise the public storage URL of the content-addressed
+    copy (if published) or of the object itself.
+    """
+    endpoint = image_endpoint_url()
+    if endpoint:
+        return f"{endpoint}/{key}{query}"
+    return build_public_url(hashed_name or object_name)
+
+
+def variant_query(width: int, image_format: str) -> str:
+    return f"?width={width}&format={image_format}"
+
+
+def parse_hashed_manifest(data: bytes) -> Dict[str, str]:
+    """
+    Parses the hashed names manifest ({"objects": {object name: hashed object name}}).
+    """
+    manifest: Dict[str, Any] = json.loads(data)
+    return dict(manifest.get("objects", {}))
+
+
+def with_hashed_urls(card: CatalogCard, hashed_names: Dict[str, str]) -> CatalogCard:
+    """
+    Returns the card with its image and variant URLs pointing to the content-addressed copies.
+    Objects without a published copy keep their plain URL.
+    """
+    if not hashed_names or image_endpoint_url():
+        return card
+    variants = tuple(
+        replace(v, public_url=build_image_url(v.object_name, card.key, hashed_name=hashed_names.get(v.object_name)))
+        for v in card.variants
+    )
+    return replace(
+        card,
+        public_url=build_image_url(card.object_name, card.key, hashed_name=hashed_names.get(card.object_name)),
+        variants=variants,
+    )
+
+
+def parse_variants_manifest(data: bytes) -> Dict[str, Tuple[ImageVariant, ...]]:
+    """
+    Parses the variants manifest ({"cards": {key: [{"object_name", "width", "height", "format"}, ...]}}).
+
+    Returns:
+        Dict[str, Tuple[ImageVariant, ...]]: Variants per card key, ordered by width and format.
+    """
+    manifest: Dict[str, Any] = json.loads(data)
+    variants: Dict[str, Tuple[ImageVariant, ...]] = {}
+    for key, entries in manifest.get("cards", {}).items():
+        parsed: List[ImageVariant] = [
+            ImageVariant(
+                object_name=entry["object_name"],
+                width=int(entry["width"]),
+                height=int(entry["height"]),
+                format=entry["format"],
+                public_url=build_image_url(
+                    entry["object_name"],
+                    key,
+                    variant_query(int(entry["width"]), entry["format"]),
+                ),
+            )
+            for entry in entries
+        ]
+        variants[key] = tuple(sorted(parsed, key=lambda variant: (variant.width, variant.format)))
+    return variants
+
+
+class CardCatalog:
+    """
+    In-memory catalog of the card deck held by the storage backend (MinIO by default).
+
+    The deck is listed once at startup and then refreshed in the background,
+    so drawing a card is a random pick from memory without any storage I/O.
+    """
+
+    def __init__(self, refresh_interval: float = CARD_CATALOG_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._snapshot: DeckSnapshot = DeckSnapshot(version=0, loaded_at=0.0)
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Parsed manifests with the ETag they were downloaded at, by object name
+        self._manifests: Dict[str, Tuple[str, Any]] = {}
+
+    @property
+    def snapshot(self) -> DeckSnapshot:
+        """Returns the currently active deck snapshot."""
+        return self._snapshot
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once at least one successful load has completed."""
+        return self._snapshot.version > 0
+
+    def random_card(self) -> Optional[CatalogCard]:
+        """
+        Picks a random card from the current snapshot.
+
+        Returns:
+            Optional[CatalogCard]: A card, or None if the deck is empty.
+        """
+        cards = self._snapshot.cards
+        return random.choice(cards) if cards else None
+
+    def card_for_user_and_day(self, sub: str, day: date) -> Optional[CatalogCard]:
+        """
+        Picks the card for a user on a given day from a keyed hash of (sub, day).
+
+        The same user gets the same card for the whole day as long as the deck does not
+        change, and the secret key keeps users from predicting other users' cards.
+
+        Returns:
+            Optional[CatalogCard]: A card, or None if the deck is empty.
+        """
+        cards = self._snapshot.cards
+        if not cards:
+            return None
+        message = f"{sub}|{day.isoformat()}".encode("utf-8")
+        digest = hmac.new(DAILY_DRAW_SECRET.encode("utf-8"), message, hashlib.sha256).digest()
+        return cards[int.from_bytes(digest[:8], "big") % len(cards)]
+
+    def get(self, key: str) -> Optional[CatalogCard]:
+        """Looks up a card by its key in the current snapshot."""
+        return self._snapshot.by_key.get(key)
+
+    async def _load_manifest(self, objects: List[Any], object_name: str, parse: Callable[[bytes], Dict]) -> Dict:
+        # A manifest is downloaded only when its ETag changes; a broken manifest keeps the last good one
+        manifest = next((obj for obj in objects if obj.object_name == object_name), None)
+        if manifest is None:
+            self._manifests.pop(object_name, None)
+            return {}
+        cached = self._manifests.get(object_name)
+        if cached is not None and cached[0] == manifest.etag:
+            return cached[1]
+        try:
+            parsed = parse(await get_storage().get_object(object_name))
+            self._manifests[object_name] = (manifest.etag, parsed)
+            return parsed
+        except Exception as e:
+            print(f"Could not load manifest '{object_name}': {e}")
+            return cached[1] if cached is not None else {}
+
+    async def refresh(self) -> DeckSnapshot:
+        """
+        Re-reads the bucket and atomically swaps in a new snapshot.
+
+        Returns:
+            DeckSnapshot: The snapshot that is active after the refresh.
+        """
+        objects = await get_storage().list_objects(recursive=True)
+        object_names = sorted(
+            obj.object_name for obj in objects
+            if obj.object_name.lower().endswith(CARD_IMAGE_EXTENSION)
+            and not obj.object_name.startswith((CARD_VARIANTS_PREFIX, CARD_HASHED_PREFIX))
+        )
+        variants = await self._load_manifest(objects, CARD_VARIANTS_MANIFEST, parse_variants_manifest)
+        hashed_names = await self._load_manifest(objects, CARD_HASHED_MANIFEST, parse_hashed_manifest)
+
+        deck: List[CatalogCard] = []
+        for name in object_names:
+            key = card_key_from_object_name(name)
+            card = CatalogCard(
+                object_name=name,
+                key=key,
+                display_name=format_card_name(name),
+                public_url=build_image_url(name, key),
+                variants=variants.get(key, ()),
+            )
+            deck.append(with_hashed_urls(card, hashed_names))
+        cards = tuple(deck)
+
+        current = self._snapshot
+        if current.version and current.cards == cards:
+            # Nothing changed, keep the existing version
+            return current
+
+        self._snapshot = DeckSnapshot(
+            version=current.version + 1,
+            loaded_at=time.time(),
+            cards=cards,
+            by_key={card.key: card for card in cards},
+        )
+        print(f"Card catalog loaded: {len(cards)} cards (version {self._snapshot.version}).")
+        return self._snapshot
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the last good snapshot
+                print(f"Card catalog refresh failed: {e}")
+
+    async def start(self):
+        """
+        Loads the deck and starts the background refresh task.
+        A failed initial load is logged; the background task keeps retrying.
+        """
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"Initial card catalog load failed: {e}")
+
+        if self.refresh_interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Cancels the background refresh task."""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+# Application-wide catalog instance, started and stopped by the lifespan handler
+card_catalog = CardCatalog()
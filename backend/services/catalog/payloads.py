@@ -0,0 +1,147 @@
+import asyncio
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from services.catalog.translations import TranslationIndex, TranslationSnapshot, translation_index
+
+# Brotli is optional: without it only gzip and identity variants are served
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment image
+    brotli = None
+
+# Compression levels for the pre-rendered variants. Payloads are built once per catalog
+# version, so the maximum levels are affordable.
+CARD_PAYLOAD_GZIP_LEVEL: int = int(os.getenv("CARD_PAYLOAD_GZIP_LEVEL", "9"))
+CARD_PAYLOAD_BROTLI_QUALITY: int = int(os.getenv("CARD_PAYLOAD_BROTLI_QUALITY", "11"))
+
+
+@dataclass(frozen=True)
+class PrerenderedPayload:
+    """
+    Serialized JSON response body with its compressed variants.
+
+    Attributes:
+    - identity (bytes): Uncompressed JSON body.
+    - gzip (bytes): gzip-compressed body.
+    - br (Optional[bytes]): Brotli-compressed body, None if brotli is unavailable.
+    """
+    identity: bytes
+    gzip: bytes
+    br: Optional[bytes] = None
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Picks the best variant for an Accept-Encoding header value.
+
+        Returns:
+            Tuple[bytes, Optional[str]]: The body and its Content-Encoding (None for identity).
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        if self.br is not None and "br" in accepted:
+            return self.br, "br"
+        if "gzip" in accepted:
+            return self.gzip, "gzip"
+        return self.identity, None
+
+
+def parse_accept_encoding(header: str) -> Set[str]:
+    """
+    Returns the content codings accepted by the client (q=0 entries are excluded).
+    A bare "*" is expanded to gzip and br.
+    """
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding == "*":
+            accepted.update(("gzip", "br"))
+        else:
+            accepted.add(coding)
+    return accepted
+
+
+def render_payload(items: List[Dict[str, str]]) -> PrerenderedPayload:
+    """
+    Serializes items exactly like FastAPI's JSONResponse and compresses the result.
+    """
+    body = json.dumps(items, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+    return PrerenderedPayload(
+        identity=body,
+        # mtime=0 keeps the gzip bytes identical across rebuilds of the same content
+        gzip=gzip.compress(body, compresslevel=CARD_PAYLOAD_GZIP_LEVEL, mtime=0),
+        br=brotli.compress(body, quality=CARD_PAYLOAD_BROTLI_QUALITY) if brotli else None,
+    )
+
+
+def build_language_payloads(snapshot: TranslationSnapshot) -> Dict[str, PrerenderedPayload]:
+    """
+    Builds the /all_cards payload of every language in a translation snapshot.
+    Cards are listed in catalog order and only with translations in that exact language.
+    """
+    payloads = {}
+    for lang in snapshot.languages:
+        items = []
+        for key in snapshot.keys:
+            entry = snapshot.entries.get((key, lang))
+            if entry:
+                items.append({"key": key, "lang": lang, "name": entry[0], "description": entry[1]})
+        payloads[lang] = render_payload(items)
+    return payloads
+
+
+class CardPayloadCache:
+    """
+    Pre-rendered, pre-compressed /all_cards response bodies per language.
+
+    Payloads are rebuilt only when the translation index version changes; serving a
+    request is a dictionary lookup.
+    """
+
+    def __init__(self, index: TranslationIndex):
+        self.index = index
+        self._version: str = ""
+        self._payloads: Dict[str, PrerenderedPayload] = {}
+        self._empty = render_payload([])
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> str:
+        """Translation index version the current payloads were built from."""
+        return self._version
+
+    async def rebuild(self):
+        """
+        Rebuilds all payloads if the translation index changed since the last build.
+        Compression runs in a worker thread so the event loop is not blocked.
+        """
+        async with self._lock:
+            snapshot = self.index.snapshot
+            if snapshot.version == self._version:
+                return
+            payloads = await asyncio.to_thread(build_language_payloads, snapshot)
+            self._payloads, self._version = payloads, snapshot.version
+            print(f"Card payloads rendered for {len(payloads)} languages (version {snapshot.version}).")
+
+    async def get(self, lang: str) -> PrerenderedPayload:
+        """
+        Returns the payload for a language. Unknown languages get an empty list.
+        """
+        if self.index.snapshot.version != self._version:
+            await self.rebuild()
+        return self._payloads.get(lang, self._empty)
+
+
+# Application-wide payload cache for /all_cards
+card_payloads = CardPayloadCache(translation_index)
@@ -0,0 +1,166 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from services.database.psql import get_all_card_translations, db_breaker
+
+# Language used when no explicit fallback chain is configured for a language
+CARD_DEFAULT_FALLBACK_LANG: str = os.getenv("CARD_DEFAULT_FALLBACK_LANG", "hu")
+
+# Per-language fallback chains, e.g. "de:en,hu;hu-AT:hu". Languages without an entry
+# fall back to CARD_DEFAULT_FALLBACK_LANG.
+CARD_LANG_FALLBACKS: str = os.getenv("CARD_LANG_FALLBACKS", "")
+
+
+def parse_fallback_chains(spec: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Parses a fallback specification such as "de:en,hu;hu-AT:hu".
+
+    Returns:
+        Dict[str, Tuple[str, ...]]: Language -> ordered fallback languages.
+    """
+    chains: Dict[str, Tuple[str, ...]] = {}
+    for part in spec.split(";"):
+        if ":" not in part:
+            continue
+        lang, fallbacks = part.split(":", 1)
+        chains[lang.strip()] = tuple(f.strip() for f in fallbacks.split(",") if f.strip())
+    return chains
+
+
+@dataclass(frozen=True)
+class TranslationSnapshot:
+    """
+    Immutable view of all card translations.
+
+    Attributes:
+    - version (str): Content hash of the translations, changes only when the data changes.
+    - loaded_at (float): UNIX timestamp of the load.
+    - entries (Dict[Tuple[str, str], Tuple[str, str]]): (key, lang) -> (name, description).
+    - keys (Tuple[str, ...]): Card keys in catalog (card id) order.
+    - languages (Tuple[str, ...]): Languages present in the data.
+    """
+    version: str = ""
+    loaded_at: float = 0.0
+    entries: Dict[Tuple[str, str], Tuple[str, str]] = field(default_factory=dict)
+    keys: Tuple[str, ...] = ()
+    languages: Tuple[str, ...] = ()
+
+
+def compute_version(rows: List[Dict[str, str]]) -> str:
+    """
+    Computes a stable content hash over translation rows.
+    """
+    digest = hashlib.sha256()
+    for row in rows:
+        for value in (row["key"], row["lang"], row["name"], row["description"]):
+            digest.update(value.encode("utf-8"))
+            digest.update(b"\x1f")
+        digest.update(b"\x1e")
+    return digest.hexdigest()[:32]
+
+
+class TranslationIndex:
+    """
+    In-memory (key, lang) index over the 'cards' and 'card_translations' tables.
+
+    The index is loaded at startup and replaced as a whole on reload, so card text
+    lookups are dictionary reads and never touch the database.
+    """
+
+    def __init__(
+        self,
+        default_fallback: str = CARD_DEFAULT_FALLBACK_LANG,
+        fallback_chains: Optional[Dict[str, Tuple[str, ...]]] = None,
+    ):
+        self.default_fallback = default_fallback
+        self.fallback_chains = fallback_chains if fallback_chains is not None else parse_fallback_chains(CARD_LANG_FALLBACKS)
+        self._snapshot = TranslationSnapshot()
+        self.last_error: Optional[str] = None
+
+    @property
+    def snapshot(self) -> TranslationSnapshot:
+        """Returns the currently active translation snapshot."""
+        return self._snapshot
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once at least one successful load has completed."""
+        return bool(self._snapshot.version)
+
+    @property
+    def is_stale(self) -> bool:
+        """
+        True if the snapshot may be out of date: the last reload failed, or the database
+        circuit breaker is open, so a catalog change could not be picked up.
+        """
+        return self.last_error is not None or db_breaker.is_open
+
+    def languages_for(self, lang: str) -> Tuple[str, ...]:
+        """
+        Returns the lookup order for a language: the language itself, then its fallbacks.
+        """
+        chain = self.fallback_chains.get(lang, (self.default_fallback,))
+        ordered = [lang]
+        for fallback in chain:
+            if fallback not in ordered:
+                ordered.append(fallback)
+        return tuple(ordered)
+
+    def lookup(self, key: str, lang: str) -> Optional[Dict[str, str]]:
+        """
+        Looks up a card's name and description, following the language's fallback chain.
+
+        Returns:
+            Optional[Dict[str, str]]: {"name": ..., "description": ...} or None
+        """
+        entries = self._snapshot.entries
+        for candidate in self.languages_for(lang):
+            entry = entries.get((key, candidate))
+            if entry:
+                return {"name": entry[0], "description": entry[1]}
+        return None
+
+    async def reload(self, read_only: bool = False) -> TranslationSnapshot:
+        """
+        Reloads all translations from the database and swaps in a new snapshot.
+
+        Args:
+            read_only (bool): Load from the read replica, if one is configured.
+
+        Returns:
+            TranslationSnapshot: The snapshot that is active after the reload.
+        """
+        try:
+            rows = await get_all_card_translations(read_only=read_only)
+        except Exception as e:
+            # The previous snapshot stays active and is served marked as stale
+            self.last_error = str(getattr(e, "detail", e))
+            raise
+        self.last_error = None
+        version = compute_version(rows)
+        if version == self._snapshot.version:
+            return self._snapshot
+
+        entries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        keys: Dict[str, None] = {}
+        languages: Dict[str, None] = {}
+        for row in rows:
+            entries[(row["key"], row["lang"])] = (row["name"], row["description"])
+            keys[row["key"]] = None
+            languages[row["lang"]] = None
+
+        self._snapshot = TranslationSnapshot(
+            version=version,
+            loaded_at=time.time(),
+            entries=entries,
+            keys=tuple(keys),
+            languages=tuple(sorted(languages)),
+        )
+        print(f"Translation index loaded: {len(entries)} translations, {len(languages)} languages (version {version}).")
+        return self._snapshot
+
+
+# Application-wide translation index, loaded by the lifespan handler
+translation_index = TranslationIndex()
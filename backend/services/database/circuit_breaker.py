@@ -0,0 +1,137 @@
+import os
+import time
+from typing import Any, Dict, Optional
+
+# Consecutive failures (connection errors, timeouts) that open the circuit
+DB_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("DB_BREAKER_FAILURE_THRESHOLD", "5"))
+
+# Seconds the circuit stays open before probe requests are let through
+DB_BREAKER_RESET_SECONDS: float = float(os.getenv("DB_BREAKER_RESET_SECONDS", "10"))
+
+# Probe requests allowed at the same time while half-open
+DB_BREAKER_HALF_OPEN_MAX_CALLS: int = int(os.getenv("DB_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling the database while the circuit is open.
+
+    Attributes:
+    - retry_after (float): Seconds until the next probe is allowed.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails fast when a dependency keeps failing, instead of letting every call wait for its timeout.
+
+    - closed: calls pass; consecutive failures are counted.
+    - open: after failure_threshold consecutive failures, calls raise CircuitOpenError
+      for reset_timeout seconds.
+    - half_open: up to half_open_max_calls probe calls pass; a success closes the circuit,
+      a failure opens it again.
+
+    Only failures that indicate an unhealthy dependency should be recorded; a query that
+    fails on its own (e.g., a constraint violation) is a success from the breaker's view.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DB_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = DB_BREAKER_RESET_SECONDS,
+        half_open_max_calls: int = DB_BREAKER_HALF_OPEN_MAX_CALLS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+        self.last_error_type: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit whose reset timeout passed reports half_open."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are being rejected or only probes pass."""
+        return self.state != CLOSED
+
+    def before_call(self):
+        """
+        Admits or rejects a call. Every admitted call must be followed by
+        record_success(), record_failure() or release().
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all probes in flight.
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+            if self._state == OPEN:
+                self._state = HALF_OPEN
+                print(f"Circuit '{self.name}' half-open; probing.")
+            self._probes += 1
+            return
+        self.rejected += 1
+        retry_after = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self):
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            print(f"Circuit '{self.name}' closed; dependency recovered.")
+        self._state = CLOSED
+        self._failures = 0
+
+    def release(self):
+        """Ends an admitted call without an outcome (e.g., the caller was cancelled)."""
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def record_failure(self, error: BaseException):
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_type = type(error).__name__
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            self._open()
+            return
+        self._failures += 1
+        if self._state == CLOSED and self._failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self.times_opened += 1
+        print(f"Circuit '{self.name}' opened for {self.reset_timeout:g}s: {self.last_error}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            # Only the exception type: messages can carry host names and other connection details
+            "last_error_type": self.last_error_type,
+        }
@@ -0,0 +1,168 @@
+import asyncio
+import os
+from datetime import date
+from typing import List, Optional, Tuple
+from services.database import psql
+from services.database.metrics import instrumented
+
+# Write-behind configuration for the 'daily_card' history table
+DRAW_HISTORY_QUEUE_SIZE: int = int(os.getenv("DRAW_HISTORY_QUEUE_SIZE", "10000"))
+DRAW_HISTORY_BATCH_SIZE: int = int(os.getenv("DRAW_HISTORY_BATCH_SIZE", "500"))
+DRAW_HISTORY_FLUSH_SECONDS: float = float(os.getenv("DRAW_HISTORY_FLUSH_SECONDS", "1.0"))
+# How long a draw request may wait for queue space before the record is dropped
+DRAW_HISTORY_ENQUEUE_TIMEOUT: float = float(os.getenv("DRAW_HISTORY_ENQUEUE_TIMEOUT", "2.0"))
+DRAW_HISTORY_MAX_RETRIES: int = int(os.getenv("DRAW_HISTORY_MAX_RETRIES", "3"))
+# Seconds after which a failed batch is retried even if no new draw arrives
+DRAW_HISTORY_RETRY_SECONDS: float = float(os.getenv("DRAW_HISTORY_RETRY_SECONDS", "5.0"))
+
+DrawRecord = Tuple[int, str, date]
+
+# Multi-row insert from arrays. Rows whose card key is not in 'cards' are skipped
+# instead of failing the whole batch on the foreign key.
+INSERT_DRAWS_QUERY = """
+    INSERT INTO daily_card (user_id, card_key, draw_date)
+    SELECT t.user_id, t.card_key, t.draw_date
+    FROM unnest($1::int[], $2::text[], $3::date[]) AS t(user_id, card_key, draw_date)
+    WHERE EXISTS (SELECT 1 FROM cards c WHERE c.key = t.card_key)
+"""
+
+
+class DrawHistoryWriter:
+    """
+    In-process write-behind queue for the 'daily_card' draw history.
+
+    Draws are enqueued by the request handler and written by a background task in
+    batches, either when a batch fills up or when the flush interval elapses. When the
+    queue is full, producers wait for space (backpressure) up to a timeout.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = DRAW_HISTORY_QUEUE_SIZE,
+        batch_size: int = DRAW_HISTORY_BATCH_SIZE,
+        flush_interval: float = DRAW_HISTORY_FLUSH_SECONDS,
+        enqueue_timeout: float = DRAW_HISTORY_ENQUEUE_TIMEOUT,
+        max_retries: int = DRAW_HISTORY_MAX_RETRIES,
+        retry_interval: float = DRAW_HISTORY_RETRY_SECONDS,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._retry_batch: List[DrawRecord] = []
+        self._retry_attempts = 0
+        self.dropped = 0
+
+    async def record(self, user_id: int, card_key: str, draw_date: date):
+        """
+        Enqueues a draw for asynchronous insertion.
+
+        Waits for queue space when the writer is behind; the record is dropped (and logged)
+        if no space frees up within the enqueue timeout, so a slow database never fails a draw.
+        """
+        if self._queue is None:
+            print("Draw history writer is not running; draw not recorded.")
+            self.dropped += 1
+            return
+        try:
+            await asyncio.wait_for(self._queue.put((user_id, card_key, draw_date)), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            print(f"Draw history queue full; dropped draw of '{card_key}' for user {user_id}.")
+
+    async def _next_batch(self) -> Tuple[List[DrawRecord], bool]:
+        # Wait for the first record, then collect more until the batch is full or the interval ends.
+        # A None item is the shutdown sentinel; it ends the batch and tells the worker to stop.
+        # While a failed batch is pending, an empty batch is returned after the retry interval
+        # so the failed batch is retried even when no new draws arrive.
+        loop = asyncio.get_running_loop()
+        batch: List[DrawRecord] = []
+        if self._retry_batch:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), self.retry_interval)
+            except asyncio.TimeoutError:
+                return batch, False
+        else:
+            item = await self._queue.get()
+        if item is None:
+            return batch, True
+        batch.append(item)
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @instrumented("insert_draw_history")
+    async def _write(self, batch: List[DrawRecord]):
+        if not psql.pool:
+            raise RuntimeError("Database pool not initialized.")
+        user_ids, card_keys, draw_dates = zip(*batch)
+        async with psql.acquire() as conn:
+            await conn.execute(INSERT_DRAWS_QUERY, list(user_ids), list(card_keys), list(draw_dates))
+
+    async def _flush(self, batch: List[DrawRecord]):
+        # A previously failed batch is retried together with the new one
+        if self._retry_batch:
+            batch = self._retry_batch + batch
+        if not batch:
+            return
+        try:
+            await self._write(batch)
+            self._retry_batch = []
+            self._retry_attempts = 0
+        except Exception as e:
+            self._retry_attempts += 1
+            if self._retry_attempts > self.max_retries:
+                self.dropped += len(batch)
+                print(f"Draw history flush failed {self._retry_attempts} times, dropping {len(batch)} draws: {e}")
+                self._retry_batch = []
+                self._retry_attempts = 0
+            else:
+                print(f"Draw history flush failed, will retry {len(batch)} draws: {e}")
+                self._retry_batch = batch
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            await self._flush(batch)
+
+        # Shutdown: this is the last chance to write, nothing is kept for a later retry
+        self._retry_attempts = self.max_retries
+        await self._flush([])
+
+    def start(self):
+        """Creates the queue and starts the background flush task."""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        Flushes everything still queued and stops the background task.
+        Must be called before the database pool is closed.
+        """
+        if self._task is None:
+            return
+        # The sentinel is queued behind pending draws, so they are all written first
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+
+
+# Application-wide draw history writer, started and stopped by the lifespan handler
+draw_history = DrawHistoryWriter()
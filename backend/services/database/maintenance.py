@@ -0,0 +1,57 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional
+from services.database.psql import purge_expired_refresh_sessions
+
+# How often expired refresh sessions are deleted in each worker (the DELETE is idempotent)
+REFRESH_SESSION_PURGE_SECONDS: float = float(os.getenv("REFRESH_SESSION_PURGE_SECONDS", "3600"))
+
+
+class PeriodicTask:
+    """
+    Runs a maintenance coroutine at startup and then every 'interval' seconds in the background.
+    A failed run is logged and retried at the next interval.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[object]], interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_once(self):
+        try:
+            await self.func()
+        except Exception as e:
+            print(f"{self.name} failed: {e}")
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once()
+
+    async def start(self):
+        """Runs the task once and starts the background loop."""
+        await self._run_once()
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Cancels the background loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def purge_refresh_sessions():
+    deleted = await purge_expired_refresh_sessions()
+    if deleted:
+        print(f"Purged {deleted} expired refresh sessions.")
+
+
+# Keeps 'refresh_sessions' from growing with every login; started and stopped by the lifespan handler
+refresh_session_purge = PeriodicTask("Refresh session purge", purge_refresh_sessions, REFRESH_SESSION_PURGE_SECONDS)
@@ -0,0 +1,193 @@
+import bisect
+import contextvars
+import functools
+import time
+from typing import Any, Callable, Dict, Tuple
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Name of the DAO operation running in the current task, set by @instrumented
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar("current_operation", default="unnamed")
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram in milliseconds.
+    Cheap enough to update on every call; percentiles are estimated from bucket bounds.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        """Records one observation."""
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket containing the given percentile."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns count, mean, max, estimated percentiles and the raw buckets."""
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets_ms": {
+                **{f"le_{bound:g}": count for bound, count in zip(self.buckets, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+class OperationStats:
+    """
+    Statistics of one named DAO operation.
+
+    Attributes:
+    - calls (int): Number of calls.
+    - errors (int): Calls that raised an exception.
+    - rows (int): Total rows returned.
+    - duration (Histogram): Whole-call latency, including the wait for a connection.
+    - query (Histogram): Time spent holding a connection (the SQL itself).
+    - acquire_wait (Histogram): Time spent waiting in pool.acquire().
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.duration = Histogram()
+        self.query = Histogram()
+        self.acquire_wait = Histogram()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "duration": self.duration.snapshot(),
+            "query": self.query.snapshot(),
+            "acquire_wait": self.acquire_wait.snapshot(),
+        }
+
+
+class DatabaseMetrics:
+    """
+    In-process metrics of the DAO layer: per-operation latency, rows and errors,
+    pool acquire waits, and the number of coroutines currently waiting for a connection.
+    """
+
+    def __init__(self):
+        self.operations: Dict[str, OperationStats] = {}
+        self.acquire_wait = Histogram()
+        self.waiters = 0
+        self.started_at = time.time()
+
+    def operation(self, name: str) -> OperationStats:
+        """Returns (and creates on first use) the stats of an operation."""
+        stats = self.operations.get(name)
+        if stats is None:
+            stats = self.operations[name] = OperationStats()
+        return stats
+
+    def observe_acquire(self, operation: str, wait_ms: float):
+        self.acquire_wait.observe(wait_ms)
+        self.operation(operation).acquire_wait.observe(wait_ms)
+
+    def observe_query(self, operation: str, held_ms: float):
+        self.operation(operation).query.observe(held_ms)
+
+    def reset(self):
+        """Clears all collected metrics."""
+        self.__init__()
+
+    def snapshot(self, pool=None) -> Dict[str, Any]:
+        """
+        Returns all metrics as a JSON-serializable dict, including pool gauges if a pool is given.
+        """
+        data: Dict[str, Any] = {
+            "since": self.started_at,
+            "acquire_wait": self.acquire_wait.snapshot(),
+            "operations": {name: stats.snapshot() for name, stats in sorted(self.operations.items())},
+        }
+        if pool is not None:
+            data["pool"] = pool_gauges(pool, self.waiters)
+        return data
+
+
+def pool_gauges(pool, waiters: int = 0) -> Dict[str, int]:
+    """
+    Returns size, idle, in-use and waiter gauges for an asyncpg pool.
+    """
+    size = pool.get_size()
+    idle = pool.get_idle_size()
+    return {
+        "min_size": pool.get_min_size(),
+        "max_size": pool.get_max_size(),
+        "size": size,
+        "idle": idle,
+        "in_use": size - idle,
+        "waiters": waiters,
+    }
+
+
+def count_rows(result: Any) -> int:
+    """Infers the number of rows from a DAO return value."""
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1 if result else 0
+    return 0
+
+
+def instrumented(name: str) -> Callable:
+    """
+    Decorator for DAO coroutines: records calls, whole-call duration, rows returned and errors
+    under the given operation name, and makes the name available to the pool acquire wrapper.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            stats = db_metrics.operation(name)
+            stats.calls += 1
+            token = current_operation.set(name)
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.duration.observe((time.perf_counter() - start) * 1000)
+                current_operation.reset(token)
+            stats.rows += count_rows(result)
+            return result
+        return wrapper
+    return decorator
+
+
+# Application-wide DAO metrics
+db_metrics = DatabaseMetrics()
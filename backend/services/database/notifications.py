@@ -0,0 +1,152 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional
+import asyncpg
+from services.database.psql import get_connect_kwargs
+
+# Channel the catalog triggers notify on (see helper_scripts: notify_catalog_change)
+CATALOG_CHANGE_CHANNEL: str = os.getenv("CATALOG_CHANGE_CHANNEL", "catalog_changed")
+
+# Notifications arriving within this window are coalesced into a single reload.
+# A reseed touches many rows in several statements; one reload is enough.
+CATALOG_RELOAD_DEBOUNCE_SECONDS: float = float(os.getenv("CATALOG_RELOAD_DEBOUNCE_SECONDS", "0.2"))
+
+# Delay bounds for reconnecting the listener after the connection is lost
+LISTENER_RECONNECT_MIN_SECONDS: float = 1.0
+LISTENER_RECONNECT_MAX_SECONDS: float = 30.0
+
+# How often the LISTEN connection is checked with 'SELECT 1', and how long the check may take.
+# A half-open connection (idle drop by a NAT or load balancer, failover without RST) never
+# reports its termination; a failed check drops it and reconnects.
+LISTENER_PING_SECONDS: float = float(os.getenv("LISTENER_PING_SECONDS", "30"))
+LISTENER_PING_TIMEOUT: float = float(os.getenv("LISTENER_PING_TIMEOUT", "5"))
+
+
+class CatalogChangeListener:
+    """
+    Holds a dedicated LISTEN connection on the catalog-change channel.
+
+    Every worker process runs its own listener, so each one reloads its in-process
+    caches within milliseconds of a committed catalog change, without polling.
+    The connection is pinged periodically and re-established automatically; after a
+    reconnect a reload is triggered as well, because notifications sent while
+    disconnected are lost.
+    """
+
+    def __init__(
+        self,
+        on_change: Callable[[], Awaitable[None]],
+        channel: str = CATALOG_CHANGE_CHANNEL,
+        debounce: float = CATALOG_RELOAD_DEBOUNCE_SECONDS,
+    ):
+        self.on_change = on_change
+        self.channel = channel
+        self.debounce = debounce
+        self._connection: Optional[asyncpg.Connection] = None
+        self._reload_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._ping_task: Optional[asyncio.Task] = None
+        self._reload_pending = False
+        self._stopped = False
+
+    def _on_notification(self, connection, pid, channel, payload):
+        print(f"Catalog change notification received (table: {payload or 'unknown'}).")
+        self.schedule_reload()
+
+    def _on_termination(self, connection):
+        if self._stopped:
+            return
+        print("Catalog listener connection lost; reconnecting...")
+        self._connection = None
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    def schedule_reload(self):
+        """
+        Schedules a debounced reload. If a reload is already running, one more
+        reload is queued so changes committed during it are not missed.
+        """
+        if self._reload_task is not None and not self._reload_task.done():
+            self._reload_pending = True
+            return
+        self._reload_task = asyncio.create_task(self._reload())
+
+    async def _reload(self):
+        while True:
+            self._reload_pending = False
+            await asyncio.sleep(self.debounce)
+            try:
+                await self.on_change()
+            except Exception as e:
+                print(f"Catalog reload after notification failed: {e}")
+            if not self._reload_pending:
+                return
+
+    async def _connect(self):
+        connection = await asyncpg.connect(**get_connect_kwargs())
+        await connection.add_listener(self.channel, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+        if LISTENER_PING_SECONDS > 0:
+            self._ping_task = asyncio.create_task(self._ping(connection))
+        print(f"Listening for catalog changes on channel '{self.channel}'.")
+
+    async def _ping(self, connection: asyncpg.Connection):
+        while not connection.is_closed():
+            await asyncio.sleep(LISTENER_PING_SECONDS)
+            try:
+                await connection.fetchval("SELECT 1", timeout=LISTENER_PING_TIMEOUT)
+            except Exception as e:
+                if self._stopped or connection is not self._connection:
+                    return
+                print(f"Catalog listener connection check failed: {e!r}")
+                # Runs the termination listener, which reconnects and reloads
+                connection.terminate()
+                return
+
+    async def _reconnect(self):
+        delay = LISTENER_RECONNECT_MIN_SECONDS
+        while not self._stopped:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except Exception as e:
+                print(f"Catalog listener reconnect failed: {e}")
+                delay = min(delay * 2, LISTENER_RECONNECT_MAX_SECONDS)
+                continue
+            # Changes may have been committed while we were not listening
+            self.schedule_reload()
+            return
+
+    async def start(self):
+        """
+        Opens the LISTEN connection. A failure is logged and retried in the background,
+        so the application can start even if the listener cannot connect yet.
+        """
+        self._stopped = False
+        try:
+            await self._connect()
+        except Exception as e:
+            print(f"Catalog listener could not connect: {e}")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def stop(self):
+        """Closes the LISTEN connection and cancels background tasks."""
+        self._stopped = True
+        for task in (self._reconnect_task, self._reload_task, self._ping_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._reconnect_task = None
+        self._reload_task = None
+        self._ping_task = None
+
+        if self._connection is not None:
+            try:
+                await self._connection.close(timeout=5)
+            except Exception as e:
+                print(f"Error closing catalog listener connection: {e}")
+            self._connection = None
@@ -0,0 +1,182 @@
+import asyncio
+import os
+import re
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+from services.database import psql
+from services.database.metrics import instrumented
+
+# 'daily_card' is range-partitioned by draw_date, one partition per calendar month
+# (see helper_scripts/alembic/versions/0003_partition_daily_card.py).
+PARTITIONED_TABLE = "daily_card"
+
+# Number of future months that always have a partition, so inserts never hit a missing one
+DAILY_CARD_PARTITIONS_AHEAD: int = int(os.getenv("DAILY_CARD_PARTITIONS_AHEAD", "3"))
+
+# Months of draw history kept (the current month included); 0 keeps everything
+DAILY_CARD_RETENTION_MONTHS: int = int(os.getenv("DAILY_CARD_RETENTION_MONTHS", "24"))
+
+# What happens to partitions past the retention window: "detach" keeps them as standalone
+# tables (for archiving), "drop" deletes them
+DAILY_CARD_RETENTION_ACTION: str = os.getenv("DAILY_CARD_RETENTION_ACTION", "detach")
+
+# How often the maintenance runs in each worker (it is idempotent and serialized by a lock)
+PARTITION_MAINTENANCE_SECONDS: float = float(os.getenv("PARTITION_MAINTENANCE_SECONDS", "21600"))
+
+# Advisory lock key that serializes maintenance across workers
+PARTITION_MAINTENANCE_LOCK_ID: int = 7_461_001
+
+# Bounds of a partition as rendered by pg_get_expr(relpartbound)
+PARTITION_BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def month_start(day: date) -> date:
+    """Returns the first day of the month of the given date."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Returns the first day of the month 'months' after the given month (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Returns the name of the partition holding the given month, e.g., daily_card_y2025m06."""
+    return f"{PARTITIONED_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+async def list_partitions(conn) -> List[Tuple[str, date, date]]:
+    """
+    Returns the attached partitions of 'daily_card' as (name, from, to) tuples, oldest first.
+    A default partition (no bounds) is not listed.
+    """
+    rows = await conn.fetch("""
+        SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = $1::regclass
+    """, PARTITIONED_TABLE)
+    partitions = []
+    for row in rows:
+        match = PARTITION_BOUND_PATTERN.search(row["bound"] or "")
+        if match:
+            partitions.append((
+                row["name"],
+                date.fromisoformat(match.group(1)),
+                date.fromisoformat(match.group(2)),
+            ))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def ensure_partitions(conn, today: date, months_ahead: int = DAILY_CARD_PARTITIONS_AHEAD) -> List[str]:
+    """
+    Creates the partitions of the current month and the next 'months_ahead' months if missing.
+
+    Returns:
+        List[str]: Names of the created partitions.
+    """
+    existing = {start for _, start, _ in await list_partitions(conn)}
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if start in existing:
+            continue
+        name = partition_name(start)
+        await conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name}
+            PARTITION OF {PARTITIONED_TABLE}
+            FOR VALUES FROM ('{start.isoformat()}') TO ('{add_months(start, 1).isoformat()}')
+        """)
+        created.append(name)
+    return created
+
+
+async def enforce_retention(
+    conn,
+    today: date,
+    retention_months: int = DAILY_CARD_RETENTION_MONTHS,
+    action: str = DAILY_CARD_RETENTION_ACTION,
+) -> List[str]:
+    """
+    Detaches or drops partitions that lie entirely before the retention window.
+    This is a catalog operation; no rows are deleted one by one.
+
+    Returns:
+        List[str]: Names of the detached or dropped partitions.
+    """
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -(retention_months - 1))
+    expired = [name for name, _, end in await list_partitions(conn) if end <= cutoff]
+    for name in expired:
+        await conn.execute(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}")
+        if action == "drop":
+            await conn.execute(f"DROP TABLE {name}")
+    return expired
+
+
+@instrumented("maintain_daily_card_partitions")
+async def maintain_partitions(today: Optional[date] = None) -> Tuple[List[str], List[str]]:
+    """
+    Creates upcoming partitions and applies the retention policy in one transaction.
+    Concurrent runs from other workers wait on an advisory lock and then find nothing to do.
+
+    Returns:
+        Tuple[List[str], List[str]]: Created and expired partition names.
+    """
+    today = today or datetime.utcnow().date()
+    async with psql.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_MAINTENANCE_LOCK_ID)
+            created = await ensure_partitions(conn, today)
+            expired = await enforce_retention(conn, today)
+    if created:
+        print(f"Created daily_card partitions: {', '.join(created)}")
+    if expired:
+        verb = "Dropped" if DAILY_CARD_RETENTION_ACTION == "drop" else "Detached"
+        print(f"{verb} daily_card partitions past retention: {', '.join(expired)}")
+    return created, expired
+
+
+class PartitionMaintenance:
+    """
+    Runs maintain_partitions() at startup and then periodically in the background.
+    """
+
+    def __init__(self, interval: float = PARTITION_MAINTENANCE_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_once(self):
+        try:
+            await maintain_partitions()
+        except Exception as e:
+            # Partitions are created months ahead, so a failed run is retried in time
+            print(f"daily_card partition maintenance failed: {e}")
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self._run_once()
+
+    async def start(self):
+        """Runs the maintenance once and starts the background task."""
+        await self._run_once()
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Cancels the background task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Application-wide maintenance task, started and stopped by the lifespan handler
+partition_maintenance = PartitionMaintenance()
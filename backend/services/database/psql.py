@@ -1,9 +1,18 @@
 from typing import Optional, List, Dict, Any
+import asyncio
+import math
 import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
 import os
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import HTTPException
-from datetime import datetime
+from datetime import datetime, date
+from services.database.metrics import db_metrics, instrumented, current_operation, pool_gauges
+from services.database.singleflight import coalesced
+from services.database.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.auth.jwt import hash_refresh_token
 
 # Load environment variables from a .env file (typically used during development)
 load_dotenv()
@@ -15,126 +24,449 @@ DATABASE_NAME: str = os.getenv("DB_NAME", "tarot_db")
 DATABASE_HOST: str = os.getenv("DB_HOST", "127.0.0.1")
 DATABASE_PORT: str = os.getenv("DB_PORT", "5432")
 
+# Connection pool configuration.
+# The total number of server connections is roughly uvicorn workers x DB_POOL_MAX_SIZE.
+DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_MAX_QUERIES: int = int(os.getenv("DB_POOL_MAX_QUERIES", "50000"))
+DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME: float = float(os.getenv("DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME", "300"))
+DB_COMMAND_TIMEOUT: float = float(os.getenv("DB_COMMAND_TIMEOUT", "10"))
+DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+DB_APPLICATION_NAME: str = os.getenv("DB_APPLICATION_NAME", "tarot-backend")
+# Seconds a caller may wait for a free pool connection. Running out of connections under load
+# is not a database failure and does not count against the circuit breaker.
+DB_POOL_ACQUIRE_TIMEOUT: float = float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "5"))
+
+# Optional read replica. When DB_REPLICA_HOST is set, read-only DAO calls use a second pool
+# on the replica; credentials and database name are shared with the primary.
+DB_REPLICA_HOST: Optional[str] = os.getenv("DB_REPLICA_HOST") or None
+DB_REPLICA_PORT: str = os.getenv("DB_REPLICA_PORT", DATABASE_PORT)
+DB_REPLICA_POOL_MAX_SIZE: int = int(os.getenv("DB_REPLICA_POOL_MAX_SIZE", str(DB_POOL_MAX_SIZE)))
+# Seconds to wait for a replica connection before falling back to the primary
+DB_REPLICA_ACQUIRE_TIMEOUT: float = float(os.getenv("DB_REPLICA_ACQUIRE_TIMEOUT", "1"))
+# Seconds a failed replica is skipped before it is tried again
+DB_REPLICA_RETRY_SECONDS: float = float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30"))
+
+# Errors that mean a pool's server is unreachable (as opposed to a failing query).
+# Timeouts are handled separately (see is_connection_error and pool_saturated).
+CONNECTION_ERRORS = (
+    OSError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.TooManyConnectionsError,
+)
+
+# Errors that trip the circuit breaker: the server is unreachable or too slow to answer
+BREAKER_ERRORS = CONNECTION_ERRORS + (asyncio.TimeoutError, asyncpg.exceptions.QueryCanceledError)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """
+    True if the error means the server is unreachable. A timeout is not: it is a slow query
+    or a busy pool (asyncio.TimeoutError is an OSError since Python 3.11, hence the check).
+    """
+    return isinstance(error, CONNECTION_ERRORS) and not isinstance(error, asyncio.TimeoutError)
+
+
+def pool_saturated(source: asyncpg.Pool) -> bool:
+    """
+    True if every connection of the pool is open and in use. An acquire timeout on a saturated
+    pool means the pool is busy; on a pool with room it means a new connection could not be opened.
+    """
+    return source.get_size() >= source.get_max_size() and source.get_idle_size() == 0
+
 # Global connection pool variable, initialized during application startup
 pool: Optional[asyncpg.Pool] = None
 
+# Read replica pool; created at startup or lazily on the first read after a failed start
+replica_pool: Optional[asyncpg.Pool] = None
+_replica_pool_lock = asyncio.Lock()
+
+# Hot statements, prepared once on every new pool connection by init_connection()
+HOT_STATEMENTS: Dict[str, str] = {
+    "user_by_sub": """
+        SELECT id, sub, email, name, created_at, last_draw_date
+        FROM users
+        WHERE sub = $1
+    """,
+    "rotate_refresh_session": """
+        UPDATE refresh_sessions s
+        SET token_hash = $2, expires_at = $3
+        FROM users u
+        WHERE s.token_hash = $1
+          AND s.expires_at > $4
+          AND u.id = s.user_id
+        RETURNING u.sub, u.name, u.email
+    """,
+    "claim_daily_draw": """
+        WITH target AS (
+            SELECT id, lang FROM users WHERE sub = $1
+        ),
+        claimed AS (
+            UPDATE users
+            SET last_draw_date = $2
+            WHERE sub = $1 AND last_draw_date IS DISTINCT FROM $2
+            RETURNING id
+        )
+        SELECT t.id, t.lang, (c.id IS NOT NULL) AS claimed
+        FROM target t
+        LEFT JOIN claimed c ON c.id = t.id
+    """,
+}
+
+
+class TarotConnection(asyncpg.Connection):
+    """
+    asyncpg connection that keeps the hot statements prepared by the pool's init hook.
+    Pooled connection proxies forward attribute access, so DAO code can reach them directly.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hot_statements: Dict[str, PreparedStatement] = {}
+
+
+async def init_connection(conn: TarotConnection):
+    """
+    Pool 'init' hook: runs once for every new connection and prepares the hot statements,
+    so they are parsed and planned once per connection instead of once per query.
+    A statement that cannot be prepared (e.g., schema not migrated yet) is skipped and
+    its queries fall back to the regular statement cache.
+    """
+    for name, query in HOT_STATEMENTS.items():
+        try:
+            conn.hot_statements[name] = await conn.prepare(query)
+        except asyncpg.exceptions.PostgresError as e:
+            print(f"Could not prepare hot statement '{name}': {e}")
+
+
+async def fetchrow_hot(conn, name: str, *args) -> Optional[asyncpg.Record]:
+    """
+    Executes a hot statement on a connection, using its prepared statement when available.
+    A statement invalidated by a schema change is prepared again once.
+    """
+    statement = conn.hot_statements.get(name)
+    if statement is None:
+        return await conn.fetchrow(HOT_STATEMENTS[name], *args)
+    try:
+        return await statement.fetchrow(*args)
+    except asyncpg.exceptions.InvalidCachedStatementError:
+        statement = conn.hot_statements[name] = await conn.prepare(HOT_STATEMENTS[name])
+        return await statement.fetchrow(*args)
+
+class PoolHealth:
+    """
+    Tracks whether a pool's server is reachable.
+
+    After a connection error the pool is marked down; once DB_REPLICA_RETRY_SECONDS have
+    passed it becomes available again for a retry, and the first success marks it up.
+    """
+
+    def __init__(self, name: str, retry_seconds: float = DB_REPLICA_RETRY_SECONDS):
+        self.name = name
+        self.retry_seconds = retry_seconds
+        self.healthy = True
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_error_type: Optional[str] = None
+        self.retry_at = 0.0
+
+    def available(self) -> bool:
+        """Returns True if the pool is up or due for a retry."""
+        return self.healthy or time.monotonic() >= self.retry_at
+
+    def record_success(self):
+        if not self.healthy:
+            print(f"Database pool '{self.name}' is reachable again.")
+        self.healthy = True
+
+    def record_failure(self, error: BaseException):
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_type = type(error).__name__
+        if self.healthy:
+            print(f"Database pool '{self.name}' marked down: {self.last_error}")
+        self.healthy = False
+        self.retry_at = time.monotonic() + self.retry_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "failures": self.failures,
+            # Only the exception type: messages can carry host names and other connection details
+            "last_error_type": self.last_error_type,
+        }
+
+
+primary_health = PoolHealth("primary")
+replica_health = PoolHealth("replica")
+
+# Guards the primary pool: after repeated failures, DAO calls fail fast with 503
+# instead of each waiting for its own timeout.
+db_breaker = CircuitBreaker("primary")
+
+def get_connect_kwargs() -> Dict[str, Any]:
+    """
+    Returns the asyncpg connection parameters built from the environment.
+    Shared by the connection pool and dedicated connections (e.g., the LISTEN connection).
+
+    Raises:
+        ValueError: If the database credentials are missing.
+    """
+    if not POSTGRES_USER or not POSTGRES_PASSWORD:
+        print("Error: Missing POSTGRES_USER or POSTGRES_PASSWORD environment variables.")
+        raise ValueError("Missing required database credentials in environment variables.")
+
+    return {
+        "database": DATABASE_NAME,
+        "user": POSTGRES_USER,
+        "password": POSTGRES_PASSWORD,
+        "host": DATABASE_HOST,
+        "port": int(DATABASE_PORT) if DATABASE_PORT else 5432,
+        # Session settings are sent as startup parameters rather than SET in a hook:
+        # the pool runs RESET ALL when a connection is released, which would undo a SET,
+        # while startup parameters are the values RESET ALL returns to.
+        "server_settings": {
+            "application_name": DB_APPLICATION_NAME,
+            "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS),
+        },
+    }
+
+async def create_pool(max_size: int = DB_POOL_MAX_SIZE, **overrides) -> asyncpg.Pool:
+    """
+    Creates an asyncpg pool with the configured limits, timeouts and hot statements.
+    Keyword overrides replace connection parameters (e.g., host and port of the replica).
+    """
+    connect_kwargs = {**get_connect_kwargs(), **overrides}
+    return await asyncpg.create_pool(
+        min_size=min(DB_POOL_MIN_SIZE, max_size),
+        max_size=max_size,
+        max_queries=DB_POOL_MAX_QUERIES,
+        max_inactive_connection_lifetime=DB_POOL_MAX_INACTIVE_CONNECTION_LIFETIME,
+        command_timeout=DB_COMMAND_TIMEOUT,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        connection_class=TarotConnection,
+        init=init_connection,
+        **connect_kwargs
+    )
+
+async def connect_to_replica() -> Optional[asyncpg.Pool]:
+    """
+    Creates the read replica pool if a replica is configured and not marked down.
+    A failure is logged and recorded; reads then use the primary until the retry delay passes.
+    """
+    global replica_pool
+    if not DB_REPLICA_HOST or replica_pool is not None:
+        return replica_pool
+
+    async with _replica_pool_lock:
+        if replica_pool is not None or not replica_health.available():
+            return replica_pool
+        settings = get_connect_kwargs()["server_settings"]
+        try:
+            replica_pool = await create_pool(
+                max_size=DB_REPLICA_POOL_MAX_SIZE,
+                host=DB_REPLICA_HOST,
+                port=int(DB_REPLICA_PORT),
+                timeout=DB_REPLICA_ACQUIRE_TIMEOUT * 5,
+                # A write routed here by mistake fails instead of reaching the replica
+                server_settings={**settings, "default_transaction_read_only": "on"},
+            )
+            replica_health.record_success()
+            print(f"Read replica pool created ({DB_REPLICA_HOST}:{DB_REPLICA_PORT}).")
+        except Exception as e:
+            replica_health.record_failure(e)
+            print(f"Failed to create read replica pool, reads use the primary: {e}")
+        return replica_pool
+
 async def connect_to_db():
     """
     Establishes an asyncpg connection pool to the PostgreSQL database.
     This should be called once during the application's startup event.
+    The optional read replica pool is created as well; its failure does not stop the startup.
     """
     global pool
     print("Attempting to create database connection pool...")
 
-    if not POSTGRES_USER or not POSTGRES_PASSWORD:
-        print("Error: Missing POSTGRES_USER or POSTGRES_PASSWORD environment variables.")
-        raise ValueError("Missing required database credentials in environment variables.")
-
     try:
-        db_port_int = int(DATABASE_PORT) if DATABASE_PORT else 5432
-        pool = await asyncpg.create_pool(
-            database=DATABASE_NAME,
-            user=POSTGRES_USER,
-            password=POSTGRES_PASSWORD,
-            host=DATABASE_HOST,
-            port=db_port_int
-        )
+        pool = await create_pool()
         print("Database connection pool created successfully.")
     except Exception as e:
         print(f"Failed to create database connection pool: {e}")
         raise e  # Propagate the exception to fail app startup
 
+    await connect_to_replica()
+
 async def close_db_connection():
     """
-    Closes the database connection pool gracefully.
+    Closes the database connection pools gracefully.
     Should be invoked during application shutdown.
     """
-    global pool
+    global pool, replica_pool
     print("Closing database connection pool...")
 
+    if replica_pool:
+        await replica_pool.close()
+        replica_pool = None
+
     if pool:
         await pool.close()
         print("Database connection pool closed.")
     else:
         print("No active database connection pool to close.")
 
-# ------------------- Data Access Layer (DAO) -------------------
-
-async def get_card_data_by_key_and_lang(key: str, lang: str = "hu") -> Optional[Dict[str, str]]:
+async def _acquire_from_replica() -> Optional[asyncpg.Connection]:
     """
-    Retrieves card name and description from the database by card key and language.
-
-    Returns:
-        Optional[Dict[str, str]]: {"name": ..., "description": ...} or None
+    Acquires a replica connection, or returns None if the replica is not configured,
+    marked down, or does not hand out a connection within DB_REPLICA_ACQUIRE_TIMEOUT.
     """
-    if not pool:
-        raise HTTPException(status_code=503, detail="Database unavailable")
+    if not DB_REPLICA_HOST or not replica_health.available():
+        return None
+    if await connect_to_replica() is None:
+        return None
     try:
-        async with pool.acquire() as connection:
-            card_row = await connection.fetchrow(
-                "SELECT id FROM cards WHERE key=$1",
-                key
-            )
-            if not card_row:
-                return None
+        conn = await replica_pool.acquire(timeout=DB_REPLICA_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError as e:
+        # A busy replica is not a down replica: only this read falls back to the primary
+        if not pool_saturated(replica_pool):
+            replica_health.record_failure(e)
+        return None
+    except CONNECTION_ERRORS as e:
+        replica_health.record_failure(e)
+        return None
+    replica_health.record_success()
+    return conn
+
+@asynccontextmanager
+async def acquire(read_only: bool = False):
+    """
+    Acquires a pooled connection and records how long the caller waited for it and how long
+    it was held, under the operation name set by @instrumented.
 
-            card_id = card_row['id']
+    With read_only=True the connection comes from the read replica when one is configured and
+    healthy, and from the primary otherwise. Writes and reads that must see a preceding write
+    use the default (primary).
 
-            row = await connection.fetchrow(
-                "SELECT name, description FROM card_translations WHERE card_id=$1 AND lang=$2",
-                card_id, lang
-            )
-            if row:
-                return {"name": row["name"], "description": row["description"]}
+    Primary connections pass the circuit breaker: while it is open, this raises
+    HTTPException(503) with a Retry-After header without touching the pool.
+    """
+    operation = current_operation.get()
+    db_metrics.waiters += 1
+    start = time.perf_counter()
+    breaker: Optional[CircuitBreaker] = None
+    try:
+        conn = await _acquire_from_replica() if read_only else None
+        source, health = (replica_pool, replica_health) if conn is not None else (pool, primary_health)
+        if conn is None:
+            try:
+                db_breaker.before_call()
+            except CircuitOpenError as e:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Database unavailable",
+                    headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+                )
+            breaker = db_breaker
+            try:
+                conn = await pool.acquire(timeout=DB_POOL_ACQUIRE_TIMEOUT)
+            except asyncio.TimeoutError as e:
+                if pool_saturated(pool):
+                    # Every connection is busy: the database is healthy, the burst is too large
+                    breaker.release()
+                else:
+                    # A new connection could not be opened in time
+                    primary_health.record_failure(e)
+                    breaker.record_failure(e)
+                raise
+            except BREAKER_ERRORS as e:
+                if is_connection_error(e):
+                    primary_health.record_failure(e)
+                breaker.record_failure(e)
+                raise
+            except BaseException:
+                breaker.release()
+                raise
+            primary_health.record_success()
+    finally:
+        db_metrics.waiters -= 1
+    acquired = time.perf_counter()
+    db_metrics.observe_acquire(operation, (acquired - start) * 1000)
+    try:
+        yield conn
+    except BREAKER_ERRORS as e:
+        # The server went away or timed out mid-query; later reads skip a failed replica
+        if is_connection_error(e):
+            health.record_failure(e)
+        if breaker:
+            breaker.record_failure(e)
+        raise
+    except Exception:
+        # The database answered (e.g., a constraint violation); it is healthy
+        if breaker:
+            breaker.record_success()
+        raise
+    except BaseException:
+        if breaker:
+            breaker.release()
+        raise
+    else:
+        if breaker:
+            breaker.record_success()
+    finally:
+        db_metrics.observe_query(operation, (time.perf_counter() - acquired) * 1000)
+        await source.release(conn)
 
-            # fallback magyarul
-            row = await connection.fetchrow(
-                "SELECT name, description FROM card_translations WHERE card_id=$1 AND lang='hu'",
-                card_id
-            )
-            if row:
-                return {"name": row["name"], "description": row["description"]}
+def get_db_metrics() -> Dict[str, Any]:
+    """
+    Returns DAO timings, error counts, pool gauges (size, idle, in use, waiters), the circuit
+    breaker state and the health of the primary and, if configured, the replica pool.
+    """
+    data = db_metrics.snapshot(pool)
+    data["circuit_breaker"] = db_breaker.snapshot()
+    data["health"] = {"primary": primary_health.snapshot()}
+    if DB_REPLICA_HOST:
+        data["health"]["replica"] = replica_health.snapshot()
+        data["replica_pool"] = pool_gauges(replica_pool) if replica_pool else None
+    return data
 
-            return None
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"DB error: {str(e)}")
+# ------------------- Data Access Layer (DAO) -------------------
 
-async def get_all_card_data(lang: Optional[str] = "hu") -> List[Dict[str, Any]]:
+# Only in-flight sharing: a reload after a catalog change must always see fresh rows
+@coalesced(ttl=0)
+@instrumented("get_all_card_translations")
+async def get_all_card_translations(read_only: bool = False) -> List[Dict[str, Any]]:
     """
-    Fetches all card translations for the given language from the 'card_translations' table.
+    Fetches every card translation in every language, ordered by card id and language.
+    Used to build the in-memory translation index.
 
     Args:
-        lang (str, optional): Language code to filter by (default is 'hu').
+        read_only (bool): Read from the replica (startup load). Reloads after a catalog change
+            notification use the primary, which is guaranteed to have the committed change.
 
     Returns:
-        List[Dict[str, Any]]: A list of card descriptions for the requested language.
+        List[Dict[str, Any]]: Rows with "key", "lang", "name" and "description".
 
     Raises:
         HTTPException: If the pool is uninitialized or the query fails.
     """
     if not pool:
-        print("Database pool not initialized.")
         raise HTTPException(status_code=503, detail="Database unavailable")
 
     try:
-        async with pool.acquire() as connection:
-            query = """
+        async with acquire(read_only=read_only) as connection:
+            rows = await connection.fetch("""
                 SELECT c.key, ct.lang, ct.name, ct.description
                 FROM cards c
                 JOIN card_translations ct ON c.id = ct.card_id
-                WHERE ct.lang = $1
-                ORDER BY c.id
-            """
-            rows = await connection.fetch(query, lang)
+                ORDER BY c.id, ct.lang
+            """)
             return [dict(row) for row in rows]
-
     except asyncpg.exceptions.PostgresError as e:
-        print(f"Postgres error while fetching cards for lang '{lang}': {e}")
+        print(f"Postgres error while fetching card translations: {e}")
         raise HTTPException(status_code=500, detail=f"Database query failed: {e}")
-    except Exception as e:
-        print(f"Unexpected error while fetching cards for lang '{lang}': {e}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
+@instrumented("insert_or_get_user")
 async def insert_or_get_user(sub: str, email: Optional[str], name: Optional[str], lang: Optional[str]) -> Dict[str, Any]:
     """
     Inserts a new user if they do not exist (based on 'sub'), then returns the user record.
@@ -162,14 +494,21 @@ async def insert_or_get_user(sub: str, email: Optional[str], name: Optional[str]
     lang = EXCLUDED.lang
     RETURNING id, sub, email, name, lang, created_at, last_draw_date;
     """
-    async with pool.acquire() as conn:
+    async with acquire() as conn:
         row = await conn.fetchrow(query, sub, email, name, lang)
-        return dict(row) if row else {}
+    # Do not serve the pre-update record from the read coalescing layer
+    get_user_by_sub.forget(sub)
+    return dict(row) if row else {}
 
+@coalesced()
+@instrumented("get_user_by_sub")
 async def get_user_by_sub(sub: str) -> Optional[Dict[str, Any]]:
     """
     Retrieves a user record from the 'users' table by their unique subject identifier.
 
+    Reads from the replica; a user missing there is looked up on the primary as well,
+    because a user created at login may not have been replicated yet.
+
     Args:
         sub (str): User's unique identifier.
 
@@ -182,68 +521,144 @@ async def get_user_by_sub(sub: str) -> Optional[Dict[str, Any]]:
     if not pool:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow("""
-            SELECT id, sub, email, name, created_at, last_draw_date
-            FROM users
-            WHERE sub = $1;
-        """, sub)
-        return dict(row) if row else None
+    async with acquire(read_only=True) as conn:
+        row = await fetchrow_hot(conn, "user_by_sub", sub)
+    if row is None and DB_REPLICA_HOST:
+        async with acquire() as conn:
+            row = await fetchrow_hot(conn, "user_by_sub", sub)
+    return dict(row) if row else None
 
-async def update_user_draw_date(sub: str):
+@instrumented("claim_daily_draw")
+async def claim_daily_draw(sub: str, today: date) -> Optional[Dict[str, Any]]:
     """
-    Updates the user's last card draw date to the current UTC timestamp.
+    Claims today's draw for a user in a single round trip.
+
+    The conditional UPDATE only succeeds if the user has not drawn on 'today' yet. Concurrent
+    claims for the same user serialize on the row lock, so at most one of them succeeds.
 
     Args:
         sub (str): User's unique identifier.
+        today (date): The draw date (UTC).
+
+    Returns:
+        Optional[Dict[str, Any]]: {"id", "lang", "claimed"} or None if the user does not exist.
+        "claimed" is False if the user already drew today.
 
     Raises:
-        HTTPException: If the database connection pool is not initialized.
+        HTTPException: If the database is not available.
     """
     if not pool:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    async with pool.acquire() as conn:
-        await conn.execute("""
-            UPDATE users
-            SET last_draw_date = $1
-            WHERE sub = $2
-        """, datetime.utcnow(), sub)
+    async with acquire() as conn:
+        row = await fetchrow_hot(conn, "claim_daily_draw", sub, today)
+    # last_draw_date may have changed; drop any coalesced user read
+    get_user_by_sub.forget(sub)
+    return dict(row) if row else None
 
-async def upsert_refresh_token_for_user(sub: str, refresh_token: str, expires_at: datetime):
+# Refresh tokens are stored as SHA-256 hashes in 'refresh_sessions' (one row per device/login).
+# Lookups by token are primary-key lookups; the raw token never reaches the database.
+
+@instrumented("create_refresh_session")
+async def create_refresh_session(sub: str, refresh_token: str, expires_at: datetime, device: Optional[str] = None) -> bool:
+    """
+    Stores a new refresh session for a user.
+
+    Args:
+        sub (str): User's unique identifier.
+        refresh_token (str): The raw refresh token (only its hash is stored).
+        expires_at (datetime): UTC expiry of the token.
+        device (Optional[str]): Client description, e.g. the User-Agent.
+
+    Returns:
+        bool: True if the session was created, False if the user does not exist.
+
+    Raises:
+        HTTPException: If the database is not available.
+    """
     if not pool:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    
-    async with pool.acquire() as conn:
-        await conn.execute("""
-            UPDATE users
-            SET refresh_token = $1,
-                refresh_token_expires_at = $2
-            WHERE sub = $3
-        """, refresh_token, expires_at, sub)
 
-async def get_user_by_refresh_token(refresh_token: str) -> Optional[Dict[str, Any]]:
+    async with acquire() as conn:
+        result = await conn.execute("""
+            INSERT INTO refresh_sessions (token_hash, user_id, device, expires_at)
+            SELECT $1, id, $3, $4
+            FROM users
+            WHERE sub = $2
+        """, hash_refresh_token(refresh_token), sub, device, expires_at)
+        return result.endswith(" 1")
+
+@instrumented("rotate_refresh_session")
+async def rotate_refresh_session(refresh_token: str, new_refresh_token: str, new_expires_at: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Atomically replaces a refresh token with a new one, if the old token is current and unexpired.
+
+    A single UPDATE takes a row lock on the session, so of two concurrent refreshes with the
+    same token only the first one matches; the second finds the hash already changed.
+
+    Args:
+        refresh_token (str): The refresh token presented by the client.
+        new_refresh_token (str): The refresh token replacing it.
+        new_expires_at (datetime): UTC expiry of the new token.
+
+    Returns:
+        Optional[Dict[str, Any]]: {"sub", "name", "email"} of the session's user, or None if the
+        token is unknown, expired or already rotated.
+
+    Raises:
+        HTTPException: If the database is not available.
+    """
     if not pool:
         raise HTTPException(status_code=503, detail="Database unavailable")
 
-    async with pool.acquire() as conn:
-        row = await conn.fetchrow("""
-            SELECT id, sub, email, name, refresh_token_expires_at
-            FROM users
-            WHERE refresh_token = $1
-        """, refresh_token)
+    async with acquire() as conn:
+        row = await fetchrow_hot(
+            conn, "rotate_refresh_session",
+            hash_refresh_token(refresh_token),
+            hash_refresh_token(new_refresh_token),
+            new_expires_at,
+            datetime.utcnow()
+        )
         return dict(row) if row else None
 
-async def delete_refresh_token(refresh_token: str):
+@instrumented("delete_refresh_session")
+async def delete_refresh_session(refresh_token: str) -> bool:
+    """
+    Deletes the refresh session of a token (logout on one device).
+
+    Returns:
+        bool: True if a session was deleted, False if the token was unknown.
+
+    Raises:
+        HTTPException: If the database is not available.
+    """
     if not pool:
         raise HTTPException(status_code=503, detail="Database unavailable")
-    async with pool.acquire() as conn:
-        await conn.execute("""
-            UPDATE users
-            SET refresh_token = NULL,
-                refresh_token_expires_at = NULL
-            WHERE refresh_token = $1
-        """, refresh_token)
 
+    async with acquire() as conn:
+        result = await conn.execute(
+            "DELETE FROM refresh_sessions WHERE token_hash = $1",
+            hash_refresh_token(refresh_token)
+        )
+        return result.endswith(" 1")
+
+@instrumented("purge_expired_refresh_sessions")
+async def purge_expired_refresh_sessions() -> int:
+    """
+    Deletes expired refresh sessions. Served by the index on 'expires_at'.
 
+    Returns:
+        int: Number of deleted sessions.
 
+    Raises:
+        HTTPException: If the database is not available.
+    """
+    if not pool:
+        raise HTTPException(status_code=503, detail="Database unavailable")
+
+    async with acquire() as conn:
+        result = await conn.execute(
+            "DELETE FROM refresh_sessions WHERE expires_at < $1",
+            datetime.utcnow()
+        )
+        return int(result.split()[-1])
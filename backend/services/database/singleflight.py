@@ -0,0 +1,103 @@
+import asyncio
+import copy
+import functools
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# How long (seconds) a coalesced read result may be reused after it completes.
+# 0 only shares in-flight calls; a small value (e.g. 0.5) also absorbs request bursts.
+DB_COALESCE_TTL_SECONDS: float = float(os.getenv("DB_COALESCE_TTL_SECONDS", "0"))
+
+# Maximum number of completed results kept for the TTL window
+DB_COALESCE_MAX_ENTRIES: int = int(os.getenv("DB_COALESCE_MAX_ENTRIES", "1024"))
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller starts the call as its own task; concurrent callers with the same key
+    await that task and get its result (or exception). Cancelling one caller does not cancel
+    the shared call. Optionally, successful results are reused for a short TTL.
+    """
+
+    def __init__(self, ttl: float = DB_COALESCE_TTL_SECONDS, max_entries: int = DB_COALESCE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs func() once for all concurrent callers with the same key.
+        """
+        self.calls += 1
+        if self.ttl > 0:
+            cached = self._results.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self.shared += 1
+                    return cached[1]
+                del self._results[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(functools.partial(self._on_done, key))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        # A call detached by forget() must not repopulate the cache with pre-write data
+        current = self._in_flight.get(key) is task
+        if current:
+            del self._in_flight[key]
+        if task.cancelled():
+            return
+        # Retrieving the exception also keeps asyncio from warning when every caller left
+        if task.exception() is None and self.ttl > 0 and current:
+            self._results[key] = (time.monotonic() + self.ttl, task.result())
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def forget(self, key: Hashable):
+        """
+        Drops a cached result so the next call hits the database. An in-flight call is
+        detached as well, so callers arriving after a write do not join a read that started before it.
+        """
+        self._results.pop(key, None)
+        self._in_flight.pop(key, None)
+
+
+def coalesced(ttl: float = DB_COALESCE_TTL_SECONDS) -> Callable:
+    """
+    Decorator for read-only DAO coroutines: concurrent calls with the same arguments share
+    one query. Callers receive their own shallow copy of dict/list results, so mutating a
+    result cannot leak into another request.
+
+    The wrapped function gets a .forget(*args, **kwargs) method to drop cached/in-flight
+    results after a write.
+    """
+    def decorator(func: Callable) -> Callable:
+        flight = SingleFlight(ttl=ttl)
+
+        def make_key(args, kwargs) -> Hashable:
+            return args, tuple(sorted(kwargs.items()))
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            result = await flight.do(make_key(args, kwargs), lambda: func(*args, **kwargs))
+            return copy.copy(result) if isinstance(result, (dict, list)) else result
+
+        wrapper.forget = lambda *args, **kwargs: flight.forget(make_key(args, kwargs))
+        wrapper.single_flight = flight
+        return wrapper
+    return decorator
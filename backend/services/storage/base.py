@@ -0,0 +1,115 @@
+import mimetypes
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+# Image types used by the deck that older mimetypes tables do not know
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """
+    Metadata of an object in a storage backend.
+
+    Attributes:
+    - object_name (str): Object name relative to the bucket (e.g., "variants/fool/640.webp").
+    - size (int): Size in bytes.
+    - etag (str): Content validator without quotes (MD5 of the content for single-part objects).
+    - content_type (str): MIME type of the content.
+    - last_modified (Optional[datetime]): Time of the last change, if known.
+    """
+    object_name: str
+    size: int
+    etag: str
+    content_type: str
+    last_modified: Optional[datetime] = None
+
+
+class ObjectNotFoundError(Exception):
+    """Raised when an object does not exist in the storage backend."""
+
+    def __init__(self, object_name: str):
+        super().__init__(f"Object '{object_name}' not found")
+        self.object_name = object_name
+
+
+def content_type_for(object_name: str) -> str:
+    """Returns the MIME type of an object by its extension, application/octet-stream if unknown."""
+    content_type, _ = mimetypes.guess_type(object_name)
+    return content_type or "application/octet-stream"
+
+
+class StorageBackend(ABC):
+    """
+    Async interface of the object storage holding the card images.
+
+    Implementations: AsyncMinioStorage (MinIO / S3), LocalFilesystemStorage (a directory
+    mirroring the bucket) and InMemoryStorage (tests and benchmarks). The active backend is
+    selected with STORAGE_BACKEND and returned by services.storage.factory.get_storage().
+    """
+
+    @abstractmethod
+    async def bucket_exists(self) -> bool:
+        """Checks whether the bucket (or its local equivalent) exists."""
+
+    @abstractmethod
+    async def list_objects(self, prefix: Optional[str] = None, recursive: bool = True) -> List[StoredObject]:
+        """Lists the objects whose names start with the prefix, sorted by name."""
+
+    @abstractmethod
+    async def stat_object(self, object_name: str) -> StoredObject:
+        """
+        Returns the metadata of one object.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+        """
+
+    @abstractmethod
+    async def get_object(self, object_name: str) -> bytes:
+        """
+        Returns the content of an object.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+        """
+
+    @abstractmethod
+    async def download_object(self, object_name: str, file_path: str, chunk_size: int = 256 * 1024) -> StoredObject:
+        """
+        Writes the content of an object into a local file, chunk by chunk.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+        """
+
+    @abstractmethod
+    def public_url(self, object_name: str) -> str:
+        """Returns the direct, unsigned URL clients load the object from."""
+
+    async def presigned_get_object(self, object_name: str, expires: timedelta = timedelta(days=7)) -> str:
+        """
+        Returns a time-limited URL for the object. Backends without request signing
+        return the public URL.
+        """
+        return self.public_url(object_name)
+
+    def has_public_urls(self) -> bool:
+        """
+        Returns False if objects are not published under public_url; card URLs then point at
+        the backend image endpoint instead.
+        """
+        return True
+
+    def local_path(self, object_name: str) -> Optional[str]:
+        """
+        Returns the path of a local file holding the object's content, if the backend keeps
+        objects as files; the image endpoint then serves the file without a disk cache copy.
+        """
+        return None
+
+    def shutdown(self):
+        """Releases the backend's resources. Should be invoked during application shutdown."""
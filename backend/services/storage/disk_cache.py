@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Set
+from services.storage.base import StorageBackend
+from services.storage.factory import get_storage
+
+# Directory holding the cached images; every worker process uses its own subdirectory
+CARD_IMAGE_CACHE_DIR: str = os.getenv("CARD_IMAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "tarot-card-images"))
+
+# Total size of the cached files per process; least recently used files are evicted beyond it
+CARD_IMAGE_CACHE_MAX_BYTES: int = int(os.getenv("CARD_IMAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Seconds a cached file is served without asking the backend whether its ETag changed
+CARD_IMAGE_CACHE_REVALIDATE_SECONDS: float = float(os.getenv("CARD_IMAGE_CACHE_REVALIDATE_SECONDS", "300"))
+
+# Size of the chunks an object is streamed to disk in
+CARD_IMAGE_DOWNLOAD_CHUNK_SIZE: int = 256 * 1024
+
+
+@dataclass
+class CachedImage:
+    """
+    An object stored in the local disk cache.
+
+    Attributes:
+    - object_name (str): Object name inside the bucket.
+    - path (str): Local file holding the object's content.
+    - size (int): File size in bytes.
+    - etag (str): The object's ETag in the backend (without quotes).
+    - content_type (str): The object's content type.
+    - validated_at (float): Monotonic time of the last ETag check against the backend.
+    """
+    object_name: str
+    path: str
+    size: int
+    etag: str
+    content_type: str
+    validated_at: float
+
+
+class DiskImageCache:
+    """
+    Size-bounded LRU cache of bucket objects on local disk, for backends that do not keep
+    objects as local files (MinIO, in-memory).
+
+    A miss streams the object from the backend into a temporary file, which is renamed into place
+    once complete; concurrent misses for the same object share one download. Entries are
+    revalidated by ETag (a stat request, no download) after revalidate_seconds, so a replaced
+    image is picked up without restarting the process.
+
+    Files handed out by acquire are pinned until release: evicting or replacing a pinned entry
+    drops it from the cache at once but unlinks its file only after the last release, so a
+    response never finds its file missing. Such files are not counted in total_bytes.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        directory: str = CARD_IMAGE_CACHE_DIR,
+        max_bytes: int = CARD_IMAGE_CACHE_MAX_BYTES,
+        revalidate_seconds: float = CARD_IMAGE_CACHE_REVALIDATE_SECONDS,
+    ):
+        self.backend = backend
+        self.directory = os.path.join(directory, str(os.getpid()))
+        self.max_bytes = max_bytes
+        self.revalidate_seconds = revalidate_seconds
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._downloads: Dict[str, asyncio.Task] = {}
+        # path -> number of responses serving it; retired paths are unlinked when no longer pinned
+        self._pins: Dict[str, int] = {}
+        self._retired: Set[str] = set()
+
+    def start(self):
+        """Creates an empty cache directory; files left by an earlier process with the same PID are removed."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def stop(self):
+        """Forgets all entries and removes the cache directory."""
+        for task in self._downloads.values():
+            task.cancel()
+        self._downloads.clear()
+        self._entries.clear()
+        self._pins.clear()
+        self._retired.clear()
+        self.total_bytes = 0
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _file_path(self, object_name: str, etag: str) -> str:
+        # Hashed names keep arbitrary object names out of the file system
+        digest = hashlib.sha256(f"{object_name}\x1f{etag}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest)
+
+    async def get(self, object_name: str) -> CachedImage:
+        """
+        Returns the cached file of an object, downloading it on a miss.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+            asyncio.TimeoutError: If the backend does not answer in time.
+        """
+        entry = self._entries.get(object_name)
+        if entry is not None and os.path.exists(entry.path):
+            if time.monotonic() - entry.validated_at < self.revalidate_seconds or await self._revalidate(entry):
+                self._entries.move_to_end(object_name)
+                self.hits += 1
+                return entry
+
+        task = self._downloads.get(object_name)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._download(object_name))
+            self._downloads[object_name] = task
+            task.add_done_callback(lambda _: self._downloads.pop(object_name, None))
+        # A client that disconnects must not cancel the download other requests wait for
+        return await asyncio.shield(task)
+
+    async def acquire(self, object_name: str) -> CachedImage:
+        """
+        Returns the cached file of an object like get, pinned until release is called with it.
+
+        Raises:
+            ObjectNotFoundError: If the object does not exist.
+            asyncio.TimeoutError: If the backend does not answer in time.
+        """
+        while True:
+            entry = await self.get(object_name)
+            # Waiters on a shared download resume later; the entry may have been evicted meanwhile
+            current = self._entries.get(object_name)
+            if current is not None and current.path == entry.path:
+                self._pins[current.path] = self._pins.get(current.path, 0) + 1
+                return current
+
+    def release(self, entry: CachedImage):
+        """Unpins a file returned by acquire, unlinking it if it left the cache in the meantime."""
+        count = self._pins.get(entry.path, 0) - 1
+        if count > 0:
+            self._pins[entry.path] = count
+            return
+        self._pins.pop(entry.path, None)
+        if entry.path in self._retired:
+            self._retired.discard(entry.path)
+            self._unlink(entry.path)
+
+    async def _revalidate(self, entry: CachedImage) -> bool:
+        """Returns True if the cached file still matches the object; a failed check keeps serving it."""
+        try:
+            stat = await self.backend.stat_object(entry.object_name)
+        except Exception as e:
+            print(f"Could not revalidate cached image '{entry.object_name}': {e}")
+            return True
+        if stat.etag != entry.etag:
+            self._remove(entry.object_name)
+            return False
+        entry.validated_at = time.monotonic()
+        return True
+
+    async def _download(self, object_name: str) -> CachedImage:
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        os.close(fd)
+        try:
+            stored = await self.backend.download_object(object_name, temp_path, CARD_IMAGE_DOWNLOAD_CHUNK_SIZE)
+            path = self._file_path(object_name, stored.etag)
+            os.replace(temp_path, path)
+            # The path is live again even if an older entry under it is waiting for its last release
+            self._retired.discard(path)
+        except BaseException:
+            # On a timeout the worker thread may still be writing; unlinking frees the space once it closes the file
+            self._unlink(temp_path)
+            raise
+
+        # A re-download with an unchanged ETag has just replaced the old file under the same path
+        previous = self._entries.pop(object_name, None)
+        if previous is not None:
+            self.total_bytes -= previous.size
+            if previous.path != path:
+                self._retire(previous.path)
+
+        entry = CachedImage(
+            object_name=object_name,
+            path=path,
+            size=os.path.getsize(path),
+            etag=stored.etag,
+            content_type=stored.content_type,
+            validated_at=time.monotonic(),
+        )
+        self._entries[object_name] = entry
+        self.total_bytes += entry.size
+        self._evict()
+        return entry
+
+    def _remove(self, object_name: str):
+        entry = self._entries.pop(object_name, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry.size
+        self._retire(entry.path)
+
+    def _retire(self, path: str):
+        if path in self._pins:
+            self._retired.add(path)
+        else:
+            self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def _evict(self):
+        # The most recently used entry is kept even if it alone exceeds the limit
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            object_name = next(iter(self._entries))
+            self._remove(object_name)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pinned": len(self._pins),
+        }
+
+
+# Application-wide image cache, started and stopped by the lifespan handler
+card_image_cache = DiskImageCache(get_storage())
@@ -0,0 +1,41 @@
+import os
+from typing import Optional
+from services.storage.base import StorageBackend
+
+# Storage backend holding the card images:
+# "minio" (default), "local" (a directory, see STORAGE_LOCAL_ROOT) or "memory" (tests and benchmarks;
+# seeded from STORAGE_LOCAL_ROOT if that directory exists).
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "minio").lower()
+
+_storage: Optional[StorageBackend] = None
+
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    """
+    Creates a storage backend by name.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if backend == "minio":
+        from services.storage.minio import storage
+        return storage
+    if backend == "local":
+        from services.storage.local import LocalFilesystemStorage
+        return LocalFilesystemStorage()
+    if backend == "memory":
+        from services.storage.local import STORAGE_LOCAL_ROOT
+        from services.storage.memory import InMemoryStorage
+        memory = InMemoryStorage()
+        if os.path.isdir(STORAGE_LOCAL_ROOT):
+            print(f"In-memory storage loaded {memory.load_directory(STORAGE_LOCAL_ROOT)} objects from {STORAGE_LOCAL_ROOT}.")
+        return memory
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}' (expected 'minio', 'local' or 'memory').")
+
+
+def get_storage() -> StorageBackend:
+    """Returns the application-wide storage backend selected by STORAGE_BACKEND."""
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+    return _storage
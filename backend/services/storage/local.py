@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from services.storage.base import StorageBackend, StoredObject, ObjectNotFoundError, content_type_for
+
+# Directory mirroring the bucket: object "variants/fool/640.webp" is the file <root>/variants/fool/640.webp
+STORAGE_LOCAL_ROOT: str = os.getenv("STORAGE_LOCAL_ROOT", "./cards")
+
+# Base URL the directory is published under (e.g., by nginx), if any; used for non-presigned image links.
+# Empty by default: card URLs then point at the backend image endpoint (/api/card_image/{key}).
+STORAGE_LOCAL_PUBLIC_URL: str = os.getenv("STORAGE_LOCAL_PUBLIC_URL", "").rstrip("/")
+
+
+def md5_of_file(path: str) -> str:
+    """
+    Returns the MD5 of a file, the ETag MinIO assigns to a single-part upload.
+    The file is memory-mapped, so it is hashed without being copied into Python memory.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return hashlib.md5(b"").hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.md5(mapped).hexdigest()
+
+
+class LocalFilesystemStorage(StorageBackend):
+    """
+    Storage backend on a local directory, for single-node deployments without MinIO.
+
+    ETags are the MD5 of the content, as with MinIO, so validators and the sync tooling
+    behave the same. They are cached per file and recomputed only when the file's size or
+    modification time changes. The image endpoint serves files straight from the directory
+    (see local_path), with no download or disk cache; unless STORAGE_LOCAL_PUBLIC_URL
+    publishes the directory elsewhere, card URLs point at that endpoint.
+    """
+
+    def __init__(self, root: str = STORAGE_LOCAL_ROOT, public_base_url: str = STORAGE_LOCAL_PUBLIC_URL):
+        self.root = os.path.realpath(root)
+        self.public_base_url = public_base_url
+        # path -> ((size, mtime_ns), etag)
+        self._etags: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _path(self, object_name: str) -> str:
+        # Object names must not escape the root directory (e.g., "../secret")
+        path = os.path.realpath(os.path.join(self.root, object_name))
+        if os.path.commonpath((self.root, path)) != self.root or not os.path.isfile(path):
+            raise ObjectNotFoundError(object_name)
+        return path
+
+    def _stat(self, object_name: str, path: str) -> StoredObject:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            raise ObjectNotFoundError(object_name)
+        version = (st.st_size, st.st_mtime_ns)
+        cached = self._etags.get(path)
+        if cached is None or cached[0] != version:
+            cached = (version, md5_of_file(path))
+            self._etags[path] = cached
+        return StoredObject(
+            object_name=object_name,
+            size=st.st_size,
+            etag=cached[1],
+            content_type=content_type_for(object_name),
+            last_modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+        )
+
+    async def bucket_exists(self) -> bool:
+        return os.path.isdir(self.root)
+
+    async def list_objects(self, prefix: Optional[str] = None, recursive: bool = True) -> List[StoredObject]:
+        def _list():
+            objects = []
+            for directory, dirs, names in os.walk(self.root):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".")) if recursive else []
+                for name in names:
+                    if name.startswith("."):
+                        continue
+                    path = os.path.join(directory, name)
+                    object_name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                    if prefix and not object_name.startswith(prefix):
+                        continue
+                    objects.append(self._stat(object_name, path))
+            return sorted(objects, key=lambda obj: obj.object_name)
+
+        return await asyncio.to_thread(_list)
+
+    async def stat_object(self, object_name: str) -> StoredObject:
+        return await asyncio.to_thread(lambda: self._stat(object_name, self._path(object_name)))
+
+    async def get_object(self, object_name: str) -> bytes:
+        def _read():
+            with open(self._path(object_name), "rb") as f:
+                return f.read()
+
+        return await asyncio.to_thread(_read)
+
+    async def download_object(self, object_name: str, file_path: str, chunk_size: int = 256 * 1024) -> StoredObject:
+        def _copy():
+            path = self._path(object_name)
+            stored = self._stat(object_name, path)
+            shutil.copyfile(path, file_path)
+            return stored
+
+        return await asyncio.to_thread(_copy)
+
+    def public_url(self, object_name: str) -> str:
+        return f"{self.public_base_url}/{object_name}"
+
+    def has_public_urls(self) -> bool:
+        return bool(self.public_base_url)
+
+    def local_path(self, object_name: str) -> Optional[str]:
+        try:
+            return self._path(object_name)
+        except ObjectNotFoundError:
+            return None
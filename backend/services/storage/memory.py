@@ -0,0 +1,87 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from services.storage.base import StorageBackend, StoredObject, ObjectNotFoundError, content_type_for
+
+# Base URL used for the (fictional) public links of in-memory objects
+STORAGE_MEMORY_PUBLIC_URL: str = os.getenv("STORAGE_MEMORY_PUBLIC_URL", "http://localhost/tarot-cards").rstrip("/")
+
+
+class InMemoryStorage(StorageBackend):
+    """
+    Storage backend keeping objects in a dictionary, for tests and benchmarks.
+
+    Every call completes without I/O, so results and timings do not depend on a running
+    MinIO. Objects are added with put_object or load_directory.
+    """
+
+    def __init__(self, public_base_url: str = STORAGE_MEMORY_PUBLIC_URL):
+        self.public_base_url = public_base_url
+        # object name -> (content, metadata)
+        self._objects: Dict[str, Tuple[bytes, StoredObject]] = {}
+
+    def put_object(self, object_name: str, data: bytes, content_type: Optional[str] = None) -> StoredObject:
+        """Stores an object, replacing an existing one with the same name."""
+        stored = StoredObject(
+            object_name=object_name,
+            size=len(data),
+            etag=hashlib.md5(data).hexdigest(),
+            content_type=content_type or content_type_for(object_name),
+            last_modified=datetime.now(timezone.utc),
+        )
+        self._objects[object_name] = (bytes(data), stored)
+        return stored
+
+    def remove_object(self, object_name: str):
+        self._objects.pop(object_name, None)
+
+    def load_directory(self, root: str, prefix: str = "") -> int:
+        """
+        Copies the files below a directory into memory (hidden files excluded), named like the
+        sync tool names them: the prefix plus the path relative to the directory.
+
+        Returns:
+            int: Number of loaded objects.
+        """
+        count = 0
+        for directory, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in names:
+                if name.startswith("."):
+                    continue
+                path = os.path.join(directory, name)
+                with open(path, "rb") as f:
+                    self.put_object(prefix + os.path.relpath(path, root).replace(os.sep, "/"), f.read())
+                count += 1
+        return count
+
+    def _entry(self, object_name: str) -> Tuple[bytes, StoredObject]:
+        entry = self._objects.get(object_name)
+        if entry is None:
+            raise ObjectNotFoundError(object_name)
+        return entry
+
+    async def bucket_exists(self) -> bool:
+        return True
+
+    async def list_objects(self, prefix: Optional[str] = None, recursive: bool = True) -> List[StoredObject]:
+        return [
+            stored for name, (_, stored) in sorted(self._objects.items())
+            if name.startswith(prefix or "") and (recursive or "/" not in name[len(prefix or ""):])
+        ]
+
+    async def stat_object(self, object_name: str) -> StoredObject:
+        return self._entry(object_name)[1]
+
+    async def get_object(self, object_name: str) -> bytes:
+        return self._entry(object_name)[0]
+
+    async def download_object(self, object_name: str, file_path: str, chunk_size: int = 256 * 1024) -> StoredObject:
+        data, stored = self._entry(object_name)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return stored
+
+    def public_url(self, object_name: str) -> str:
+        return f"{self.public_base_url}/{object_name}"
@@ -1,22 +1,216 @@
 from minio import Minio
+from minio.error import S3Error
+import asyncio
+import functools
 import os
+import urllib3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, List, Optional
 from dotenv import load_dotenv  # Ensure environment variables are loaded from a .env file
+from services.storage.base import StorageBackend, StoredObject, ObjectNotFoundError, content_type_for
 
 # Load environment variables – essential for MinIO credentials and configuration
 load_dotenv()
 
+# Async adapter configuration: size of the dedicated SDK thread pool, the maximum number
+# of SDK calls allowed in flight at once, and per-call / HTTP timeouts (seconds).
+MINIO_MAX_WORKERS: int = int(os.getenv("MINIO_MAX_WORKERS", "8"))
+MINIO_MAX_CONCURRENCY: int = int(os.getenv("MINIO_MAX_CONCURRENCY", str(MINIO_MAX_WORKERS)))
+MINIO_CALL_TIMEOUT: float = float(os.getenv("MINIO_CALL_TIMEOUT", "10"))
+MINIO_CONNECT_TIMEOUT: float = float(os.getenv("MINIO_CONNECT_TIMEOUT", "3"))
+MINIO_READ_TIMEOUT: float = float(os.getenv("MINIO_READ_TIMEOUT", "10"))
+# Overall timeout of a streamed download into a local file (seconds)
+MINIO_DOWNLOAD_TIMEOUT: float = float(os.getenv("MINIO_DOWNLOAD_TIMEOUT", "60"))
+
 # Create a MinIO client instance using credentials and configuration from environment variables.
 # Defining it at the top-level scope makes it accessible throughout the application.
+# The HTTP pool is sized to the worker pool so every worker thread can hold a connection,
+# and the socket timeouts make sure a stuck request eventually frees its thread.
 client: Minio = Minio(
     os.getenv("MINIO_ENDPOINT", "test"),  # MinIO endpoint
     access_key=os.getenv("MINIO_ROOT_USER", "test"),
     secret_key=os.getenv("MINIO_ROOT_PASSWORD", "test"),
-    secure=os.getenv("MINIO_SECURE", "false").lower() == "true"  # Use HTTPS if specified
+    secure=os.getenv("MINIO_SECURE", "false").lower() == "true",  # Use HTTPS if specified
+    http_client=urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=MINIO_CONNECT_TIMEOUT, read=MINIO_READ_TIMEOUT),
+        maxsize=MINIO_MAX_WORKERS,
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    ),
 )
 
 # Define the bucket name to be used throughout the application
 BUCKET_NAME: str = os.getenv("MINIO_BUCKET_TAROT", "test")
 
+# Public base URL used to build non-presigned image links for the frontend
+MINIO_PUBLIC_URL: str = os.getenv("MINIO_PUBLIC_URL", "http://localhost:9000")
+
+# S3 error codes of a missing object
+NOT_FOUND_CODES = ("NoSuchKey", "NoSuchObject")
+
+
+def to_stored_object(obj: Any) -> StoredObject:
+    """Converts an object returned by the MinIO SDK (listing or stat) into a StoredObject."""
+    return StoredObject(
+        object_name=obj.object_name,
+        size=obj.size or 0,
+        etag=(obj.etag or "").strip('"'),
+        content_type=obj.content_type or content_type_for(obj.object_name),
+        last_modified=obj.last_modified,
+    )
+
+
+def not_found(e: S3Error, object_name: str) -> Exception:
+    """Maps a missing-object S3 error to ObjectNotFoundError; other errors are returned as is."""
+    return ObjectNotFoundError(object_name) if e.code in NOT_FOUND_CODES else e
+
+
+class AsyncMinioStorage(StorageBackend):
+    """
+    Storage backend on MinIO: an awaitable facade over the synchronous MinIO SDK.
+
+    Every SDK call runs on a dedicated, bounded thread pool so the event loop is never
+    blocked by storage round trips. A semaphore caps the number of calls in flight and
+    each call is awaited with a timeout.
+
+    A timed-out call keeps its concurrency slot until the worker thread actually returns,
+    so slow storage cannot pile up more threads than the configured limit. Waiting for a slot
+    counts against the same timeout, so calls fail instead of queueing forever behind hung ones.
+    """
+
+    def __init__(
+        self,
+        minio_client: Minio,
+        bucket_name: str,
+        max_workers: int = MINIO_MAX_WORKERS,
+        max_concurrency: int = MINIO_MAX_CONCURRENCY,
+        timeout: float = MINIO_CALL_TIMEOUT,
+    ):
+        self.client = minio_client
+        self.bucket_name = bucket_name
+        self.timeout = timeout
+        self._max_workers = max_workers
+        self._max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="minio-io",
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Runs a blocking SDK function on the storage thread pool.
+
+        Raises:
+            asyncio.TimeoutError: If no slot frees up or the call does not finish within the timeout.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.timeout)
+        await asyncio.wait_for(self._semaphore.acquire(), timeout or self.timeout)
+        try:
+            future = loop.run_in_executor(self._get_executor(), functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # Release the slot only when the thread is done, not when the caller gives up
+        future.add_done_callback(lambda _: self._semaphore.release())
+
+        return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+
+    async def bucket_exists(self) -> bool:
+        """Checks whether the configured bucket exists."""
+        return await self._run(self.client.bucket_exists, self.bucket_name)
+
+    async def list_objects(self, prefix: Optional[str] = None, recursive: bool = True) -> List[StoredObject]:
+        """
+        Lists objects in the bucket. The SDK returns a lazy iterator that performs
+        HTTP requests while iterating, so it is fully consumed on the worker thread.
+        """
+        def _list():
+            return [
+                to_stored_object(obj)
+                for obj in self.client.list_objects(self.bucket_name, prefix=prefix, recursive=recursive)
+                if not obj.is_dir
+            ]
+
+        return await self._run(_list)
+
+    async def stat_object(self, object_name: str) -> StoredObject:
+        """Returns object metadata (size, etag, content type, last modified)."""
+        try:
+            return to_stored_object(await self._run(self.client.stat_object, self.bucket_name, object_name))
+        except S3Error as e:
+            raise not_found(e, object_name)
+
+    async def presigned_get_object(self, object_name: str, expires: timedelta = timedelta(days=7)) -> str:
+        """Generates a presigned GET URL for an object."""
+        return await self._run(self.client.presigned_get_object, self.bucket_name, object_name, expires=expires)
+
+    async def get_object(self, object_name: str) -> bytes:
+        """Downloads an object and returns its content."""
+        def _get():
+            response = self.client.get_object(self.bucket_name, object_name)
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+
+        try:
+            return await self._run(_get)
+        except S3Error as e:
+            raise not_found(e, object_name)
+
+    async def download_object(self, object_name: str, file_path: str, chunk_size: int = 256 * 1024) -> StoredObject:
+        """
+        Streams an object into a local file chunk by chunk, without holding it in memory.
+        The returned metadata is taken from the response, so it matches the written content.
+        """
+        def _download():
+            response = self.client.get_object(self.bucket_name, object_name)
+            try:
+                size = 0
+                with open(file_path, "wb") as f:
+                    for chunk in response.stream(chunk_size):
+                        f.write(chunk)
+                        size += len(chunk)
+                return StoredObject(
+                    object_name=object_name,
+                    size=size,
+                    etag=(response.headers.get("etag") or "").strip('"'),
+                    content_type=response.headers.get("content-type") or content_type_for(object_name),
+                )
+            finally:
+                response.close()
+                response.release_conn()
+
+        try:
+            return await self._run(_download, timeout=MINIO_DOWNLOAD_TIMEOUT)
+        except S3Error as e:
+            raise not_found(e, object_name)
+
+    def public_url(self, object_name: str) -> str:
+        """Builds the direct public URL of an object in the bucket."""
+        return f"{MINIO_PUBLIC_URL}/{self.bucket_name}/{object_name}"
+
+    def shutdown(self):
+        """Stops the worker threads. Should be invoked during application shutdown."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Application-wide MinIO backend; endpoints and services obtain it through services.storage.factory.get_storage()
+storage = AsyncMinioStorage(client, BUCKET_NAME)
+
 # Optional check that can be performed at application startup to verify bucket existence.
 # This can be invoked from a lifespan handler or startup event.
 async def check_bucket_exists():
@@ -26,7 +220,7 @@ async def check_bucket_exists():
     to be called during application startup to ensure readiness.
     """
     try:
-        found = client.bucket_exists(BUCKET_NAME)
+        found = await storage.bucket_exists()
         if not found:
             print(f"Warning: MinIO bucket '{BUCKET_NAME}' does not exist.")
             # Optionally: create the bucket or raise an error depending on application policy.
@@ -40,4 +234,4 @@ async def check_bucket_exists():
         # raise e
 
 # The MinIO client handles its own connections and does not require explicit closing.
-# Unlike connection pools (e.g., asyncpg), no cleanup function is needed for shutdown.
+# The async facade's worker threads are stopped via get_storage().shutdown() during application shutdown.
@@ -0,0 +1,88 @@
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Tuple
+from services.storage.base import StorageBackend
+from services.storage.factory import get_storage
+
+# Lifetime of issued signatures (S3 caps presigned URLs at 7 days)
+PRESIGNED_URL_EXPIRY_SECONDS: int = int(os.getenv("PRESIGNED_URL_EXPIRY_SECONDS", str(24 * 3600)))
+
+# Fraction of the lifetime after which a cached URL is re-signed.
+# With the defaults a URL is reused for 12 hours and stays valid for at least 12 more.
+PRESIGNED_URL_REFRESH_FRACTION: float = float(os.getenv("PRESIGNED_URL_REFRESH_FRACTION", "0.5"))
+
+# Maximum number of object names kept in the cache
+PRESIGNED_URL_CACHE_SIZE: int = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "256"))
+
+
+class PresignedUrlCache:
+    """
+    LRU cache of presigned GET URLs keyed by object name.
+
+    The same object keeps returning the same URL until a configurable fraction of the
+    signature lifetime has passed, which lets browsers and proxies cache the image.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        expiry_seconds: int = PRESIGNED_URL_EXPIRY_SECONDS,
+        refresh_fraction: float = PRESIGNED_URL_REFRESH_FRACTION,
+        max_size: int = PRESIGNED_URL_CACHE_SIZE,
+    ):
+        if not 0 < refresh_fraction <= 1:
+            raise ValueError("refresh_fraction must be in (0, 1].")
+        self.backend = backend
+        self.expiry = timedelta(seconds=expiry_seconds)
+        self.reuse_seconds = expiry_seconds * refresh_fraction
+        # Every URL handed out stays valid for at least this long
+        self.min_remaining_seconds = expiry_seconds - self.reuse_seconds
+        self.max_size = max_size
+        # object_name -> (url, monotonic time after which the URL is re-signed)
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def _lookup(self, object_name: str, now: float) -> Optional[str]:
+        entry = self._entries.get(object_name)
+        if entry is None:
+            return None
+        url, refresh_at = entry
+        if now >= refresh_at:
+            del self._entries[object_name]
+            return None
+        self._entries.move_to_end(object_name)
+        return url
+
+    async def get_url(self, object_name: str) -> str:
+        """
+        Returns a presigned URL for the object, signing a new one only when the
+        cached URL is missing or past its reuse window.
+        """
+        url = self._lookup(object_name, time.monotonic())
+        if url is not None:
+            return url
+
+        # Take the timestamp before signing so the reuse window never outlives the signature
+        signed_at = time.monotonic()
+        url = await self.backend.presigned_get_object(object_name, expires=self.expiry)
+
+        self._entries[object_name] = (url, signed_at + self.reuse_seconds)
+        self._entries.move_to_end(object_name)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return url
+
+    def invalidate(self, object_name: Optional[str] = None):
+        """Drops one cached URL, or all of them when no object name is given."""
+        if object_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(object_name, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Application-wide presigned URL cache used by the card endpoints
+presigned_urls = PresignedUrlCache(get_storage())
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Callable, Optional
+from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+# ASGI extension for sending a file with os.sendfile (https://asgi.readthedocs.io/en/latest/extensions.html)
+ZERO_COPY_EXTENSION: str = "http.response.zerocopysend"
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """
+    FileResponse that hands whole files and single ranges to the server as file descriptors when
+    it offers the ASGI zero-copy send extension, so the server can send them with sendfile.
+    Servers without the extension (uvicorn among them) get Starlette's default: the file is read
+    in chunks on a worker thread. Multipart range responses always use the default.
+
+    'on_close' runs once the response has been sent or has failed (e.g., the client disconnected),
+    for releasing resources that must outlive the handler, like a pinned cache file.
+    """
+
+    def __init__(self, path: str, on_close: Optional[Callable[[], None]] = None, **kwargs):
+        super().__init__(path, **kwargs)
+        self.on_close = on_close
+        self._zero_copy = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zero_copy = ZERO_COPY_EXTENSION in scope.get("extensions", {})
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.on_close is not None:
+                self.on_close()
+
+    async def _send_file(self, send: Send, status_code: int, offset: int, count: Optional[int]) -> None:
+        # Opened before the headers go out, so a missing file still fails the whole response
+        file = await asyncio.to_thread(open, self.path, "rb")
+        try:
+            await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+            message = {"type": ZERO_COPY_EXTENSION, "file": file, "offset": offset, "more_body": False}
+            if count is not None:
+                message["count"] = count
+            await send(message)
+        finally:
+            file.close()
+
+    async def _handle_simple(self, send: Send, send_header_only: bool) -> None:
+        if not self._zero_copy or send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        await self._send_file(send, self.status_code, 0, None)
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not self._zero_copy or send_header_only:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await self._send_file(send, 206, start, end - start)
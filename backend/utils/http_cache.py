@@ -0,0 +1,74 @@
+import hashlib
+import os
+from email.utils import formatdate
+from typing import Dict, Optional
+from fastapi import Response
+
+# Cache-Control sent with catalog responses (all_cards, card_description).
+# stale-while-revalidate lets clients show the cached deck while they revalidate with If-None-Match.
+CATALOG_CACHE_CONTROL: str = os.getenv(
+    "CATALOG_CACHE_CONTROL",
+    "public, max-age=300, stale-while-revalidate=86400",
+)
+
+# Set on catalog responses served from an in-memory snapshot that may be out of date
+# (database unreachable or last reload failed). Such responses are not reused without revalidation.
+CATALOG_STALE_HEADER: str = "X-Catalog-Stale"
+
+
+def make_etag(*parts: str) -> str:
+    """
+    Builds a strong ETag from the given parts (e.g., content version, language).
+    The parts are hashed so arbitrary path or query values cannot break the header syntax.
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluates an If-None-Match header against an ETag.
+    Uses weak comparison, as required for If-None-Match (RFC 9110, 13.1.2).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def format_http_date(timestamp: float) -> str:
+    """
+    Formats a UNIX timestamp as an HTTP date (e.g., for Last-Modified).
+    """
+    return formatdate(timestamp, usegmt=True)
+
+
+def catalog_cache_headers(etag: str, last_modified: float, stale: bool = False) -> Dict[str, str]:
+    """
+    Returns the validator and caching headers for a catalog response.
+    A stale response is marked with CATALOG_STALE_HEADER and must be revalidated before reuse.
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_http_date(last_modified),
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+    }
+    if stale:
+        headers[CATALOG_STALE_HEADER] = "1"
+        headers["Cache-Control"] = "no-cache"
+    return headers
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """
+    Returns an empty 304 Not Modified response carrying the given headers.
+    """
+    return Response(status_code=304, headers=headers)
@@ -1,4 +1,8 @@
+import os
 from logging.config import fileConfig
+from urllib.parse import quote_plus
+
+from dotenv import load_dotenv
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -20,10 +24,24 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = None
 
-# other values from the config, defined by the needs of env.py,
-# can be acquired:
-# my_important_option = config.get_main_option("my_important_option")
-# ... etc.
+# The schema is written as raw SQL in versions/ (there are no ORM models to autogenerate from).
+# The database URL is built from the same environment variables as the other helper scripts,
+# so credentials never live in alembic.ini.
+load_dotenv()
+
+
+def get_database_url() -> str:
+    """Builds the SQLAlchemy URL of the target database from the environment."""
+    user = quote_plus(os.getenv("DB_USER", "test"))
+    password = quote_plus(os.getenv("DB_PASSWORD", "test"))
+    host = os.getenv("DB_HOST_HELPER_SCRIPTS", "localhost")
+    port = os.getenv("DB_PORT", "5432")
+    name = os.getenv("DB_NAME", "test")
+    return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
+
+
+# '%' must be escaped for ConfigParser interpolation
+config.set_main_option("sqlalchemy.url", get_database_url().replace("%", "%%"))
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,123 @@
+"""Initial schema: catalog, users, draws, refresh sessions and catalog change notifications.
+
+Mirrors set_up_db_and_all_tables_multilanguage_psql_prod.py. Every statement is idempotent,
+so databases created by the setup scripts can be brought under version control with
+'alembic upgrade head' as well.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-06-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose changes are announced on the 'catalog_changed' channel
+CATALOG_TABLES = ("cards", "card_translations")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS cards (
+        id SERIAL PRIMARY KEY,
+        key VARCHAR(100) NOT NULL UNIQUE
+    );
+    """)
+
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS card_translations (
+        id SERIAL PRIMARY KEY,
+        card_id INTEGER NOT NULL REFERENCES cards(id) ON DELETE CASCADE,
+        lang VARCHAR(10) NOT NULL,
+        name TEXT NOT NULL,
+        description TEXT NOT NULL,
+        UNIQUE (card_id, lang)
+    );
+    """)
+
+    # refresh_token / refresh_token_expires_at are legacy columns, superseded by refresh_sessions
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id SERIAL PRIMARY KEY,
+        sub VARCHAR(255) NOT NULL UNIQUE,
+        email VARCHAR(255),
+        name VARCHAR(255),
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+        last_draw_date DATE,
+        lang VARCHAR(10) NOT NULL DEFAULT 'hu',
+        refresh_token TEXT,
+        refresh_token_expires_at TIMESTAMP
+    );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_users_lang ON users(lang);")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_users_sub ON users(sub);")
+
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS daily_card (
+        id SERIAL PRIMARY KEY,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        card_key VARCHAR(100) NOT NULL REFERENCES cards(key) ON DELETE RESTRICT,
+        draw_date DATE NOT NULL DEFAULT CURRENT_DATE
+    );
+    """)
+    # The setup script creates daily_card partitioned, with its own (user_id, draw_date) index;
+    # the single-column indexes are only for the plain table that 0003 partitions.
+    op.execute("""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_class WHERE relname = 'daily_card' AND relkind = 'p') THEN
+            CREATE INDEX IF NOT EXISTS idx_daily_card_user_id ON daily_card(user_id);
+            CREATE INDEX IF NOT EXISTS idx_daily_card_draw_date ON daily_card(draw_date);
+        END IF;
+    END
+    $$;
+    """)
+
+    op.execute("""
+    CREATE TABLE IF NOT EXISTS refresh_sessions (
+        token_hash BYTEA PRIMARY KEY CHECK (octet_length(token_hash) = 32),
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        device VARCHAR(255),
+        created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+        expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+    );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_refresh_sessions_expires_at ON refresh_sessions(expires_at);")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_refresh_sessions_user_id ON refresh_sessions(user_id);")
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('catalog_changed', TG_TABLE_NAME);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_catalog_change ON {table};")
+        op.execute(f"""
+        CREATE TRIGGER {table}_notify_catalog_change
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_catalog_change ON {table};")
+    op.execute("DROP FUNCTION IF EXISTS notify_catalog_change();")
+    op.execute("DROP TABLE IF EXISTS refresh_sessions;")
+    op.execute("DROP TABLE IF EXISTS daily_card;")
+    op.execute("DROP TABLE IF EXISTS users;")
+    op.execute("DROP TABLE IF EXISTS card_translations;")
+    op.execute("DROP TABLE IF EXISTS cards;")
@@ -0,0 +1,142 @@
+"""Performance indexes, built with CREATE INDEX CONCURRENTLY.
+
+- card_translations(card_id, lang) INCLUDE (name, description): the translation lookups
+  are answered by index-only scans. Descriptions are short; btree entries are limited
+  to roughly 2.7 kB.
+- daily_card(user_id, draw_date): a user's draw history in date order; supersedes the
+  single-column user_id index.
+
+Concurrent builds cannot run inside a transaction, so they run in autocommit blocks and do
+not lock out writes on production tables. An interrupted build leaves an INVALID index
+behind; it is dropped and rebuilt on the next run.
+
+Postgres cannot build or drop indexes CONCURRENTLY on a partitioned table, which daily_card
+is when created by the setup script. There the index is created on the parent only
+(ON ONLY, invalid at first), built concurrently on each partition and attached; the parent
+becomes valid once every partition is attached. Old indexes are dropped without CONCURRENTLY.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-06-01 00:00:01.000000
+
+"""
+from typing import List, Sequence, Set, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, definition)
+INDEXES = (
+    (
+        "idx_card_translations_card_id_lang_covering",
+        "card_translations",
+        "(card_id, lang) INCLUDE (name, description)",
+    ),
+    (
+        "idx_daily_card_user_id_draw_date",
+        "daily_card",
+        "(user_id, draw_date)",
+    ),
+)
+
+
+def drop_invalid_index(name: str) -> None:
+    """Drops an index left INVALID by an interrupted concurrent build."""
+    invalid = op.get_bind().execute(sa.text("""
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name AND NOT i.indisvalid
+    """), {"name": name}).scalar()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+
+
+def is_partitioned(table: str) -> bool:
+    """Returns True if the table is partitioned (created by the setup script or after 0003)."""
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_class WHERE relname = :table AND relkind = 'p'"
+    ), {"table": table}).scalar())
+
+
+def index_is_valid(name: str) -> bool:
+    return bool(op.get_bind().execute(sa.text("""
+        SELECT i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = :name
+    """), {"name": name}).scalar())
+
+
+def list_partitions(table: str) -> List[str]:
+    return list(op.get_bind().execute(sa.text("""
+        SELECT child.relname
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        WHERE parent.relname = :table
+        ORDER BY child.relname
+    """), {"table": table}).scalars())
+
+
+def attached_partitions(index: str) -> Set[str]:
+    """Returns the partitions whose index is already attached to the partitioned index."""
+    return set(op.get_bind().execute(sa.text("""
+        SELECT tbl.relname
+        FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_index child ON child.indexrelid = i.inhrelid
+        JOIN pg_class tbl ON tbl.oid = child.indrelid
+        WHERE parent.relname = :index
+    """), {"index": index}).scalars())
+
+
+def create_index(name: str, table: str, definition: str) -> None:
+    """Creates an index without blocking writes, on plain and partitioned tables."""
+    if not is_partitioned(table):
+        drop_invalid_index(name)
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition};")
+        return
+    if index_is_valid(name):
+        return
+    # An invalid parent index is the unfinished state of this procedure; it is resumed, not dropped
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition};")
+    # Partitions created meanwhile get a matching index attached automatically
+    attached = attached_partitions(name)
+    for partition in list_partitions(table):
+        if partition in attached:
+            continue
+        # e.g. idx_daily_card_user_id_draw_date_y2025m06 for partition daily_card_y2025m06
+        child = f"{name}_{partition[len(table) + 1:]}"
+        drop_invalid_index(child)
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} ON {partition} {definition};")
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {child};")
+
+
+def drop_index(name: str, table: str) -> None:
+    """Drops an index, concurrently unless the table is partitioned."""
+    concurrently = "" if is_partitioned(table) else "CONCURRENTLY "
+    op.execute(f"DROP INDEX {concurrently}IF EXISTS {name};")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, definition in INDEXES:
+            create_index(name, table, definition)
+        drop_index("idx_daily_card_user_id", "daily_card")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        create_index("idx_daily_card_user_id", "daily_card", "(user_id)")
+        for name, table, _ in INDEXES:
+            drop_index(name, table)
@@ -0,0 +1,123 @@
+"""Range-partition daily_card by draw_date, one partition per month.
+
+The existing table is renamed, a partitioned 'daily_card' takes its place (same columns,
+same id sequence), partitions are created from the oldest draw up to three months ahead,
+and the rows are copied over. The copy runs in the migration transaction and blocks
+writes to daily_card until it commits.
+
+The primary key becomes (id, draw_date): unique constraints on a partitioned table must
+include the partition key. The draw_date index is dropped; partition pruning replaces it.
+Partitions are named daily_card_yYYYYmMM and maintained at runtime by
+backend/services/database/partitions.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-06-01 00:00:02.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Future months that get a partition right away (matches DAILY_CARD_PARTITIONS_AHEAD)
+PARTITIONS_AHEAD = 3
+
+
+def is_partitioned() -> bool:
+    """Returns True if daily_card is already partitioned (e.g., created by the setup script)."""
+    return bool(op.get_bind().execute(sa.text(
+        "SELECT 1 FROM pg_class WHERE relname = 'daily_card' AND relkind = 'p'"
+    )).scalar())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if is_partitioned():
+        # Created partitioned by the setup script; drop single-column indexes an earlier 0001 may have added
+        op.execute("DROP INDEX IF EXISTS idx_daily_card_user_id;")
+        op.execute("DROP INDEX IF EXISTS idx_daily_card_draw_date;")
+        return
+
+    op.execute("ALTER TABLE daily_card RENAME TO daily_card_unpartitioned;")
+    op.execute("ALTER TABLE daily_card_unpartitioned RENAME CONSTRAINT daily_card_pkey TO daily_card_unpartitioned_pkey;")
+    op.execute("DROP INDEX IF EXISTS idx_daily_card_user_id;")
+    op.execute("DROP INDEX IF EXISTS idx_daily_card_draw_date;")
+    op.execute("DROP INDEX IF EXISTS idx_daily_card_user_id_draw_date;")
+    op.execute("ALTER SEQUENCE daily_card_id_seq OWNED BY NONE;")
+
+    op.execute("""
+    CREATE TABLE daily_card (
+        id INTEGER NOT NULL DEFAULT nextval('daily_card_id_seq'),
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        card_key VARCHAR(100) NOT NULL REFERENCES cards(key) ON DELETE RESTRICT,
+        draw_date DATE NOT NULL DEFAULT CURRENT_DATE,
+        PRIMARY KEY (id, draw_date)
+    ) PARTITION BY RANGE (draw_date);
+    """)
+    op.execute("ALTER SEQUENCE daily_card_id_seq OWNED BY daily_card.id;")
+    op.execute("CREATE INDEX idx_daily_card_user_id_draw_date ON daily_card(user_id, draw_date);")
+
+    op.execute(f"""
+    DO $$
+    DECLARE
+        month DATE := date_trunc('month', LEAST(
+            (SELECT min(draw_date) FROM daily_card_unpartitioned),
+            CURRENT_DATE
+        ))::date;
+        last_month DATE := (date_trunc('month', CURRENT_DATE) + interval '{PARTITIONS_AHEAD} months')::date;
+    BEGIN
+        WHILE month <= last_month LOOP
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF daily_card FOR VALUES FROM (%L) TO (%L)',
+                'daily_card_' || to_char(month, '"y"YYYY"m"MM'),
+                month,
+                (month + interval '1 month')::date
+            );
+            month := (month + interval '1 month')::date;
+        END LOOP;
+    END
+    $$;
+    """)
+
+    op.execute("""
+    INSERT INTO daily_card (id, user_id, card_key, draw_date)
+    SELECT id, user_id, card_key, draw_date FROM daily_card_unpartitioned;
+    """)
+    op.execute("DROP TABLE daily_card_unpartitioned;")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not is_partitioned():
+        return
+
+    op.execute("ALTER TABLE daily_card RENAME TO daily_card_partitioned;")
+    op.execute("DROP INDEX IF EXISTS idx_daily_card_user_id_draw_date;")
+    op.execute("ALTER TABLE daily_card_partitioned RENAME CONSTRAINT daily_card_pkey TO daily_card_partitioned_pkey;")
+    op.execute("ALTER SEQUENCE daily_card_id_seq OWNED BY NONE;")
+
+    op.execute("""
+    CREATE TABLE daily_card (
+        id INTEGER PRIMARY KEY DEFAULT nextval('daily_card_id_seq'),
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        card_key VARCHAR(100) NOT NULL REFERENCES cards(key) ON DELETE RESTRICT,
+        draw_date DATE NOT NULL DEFAULT CURRENT_DATE
+    );
+    """)
+    op.execute("ALTER SEQUENCE daily_card_id_seq OWNED BY daily_card.id;")
+    op.execute("CREATE INDEX idx_daily_card_user_id_draw_date ON daily_card(user_id, draw_date);")
+    op.execute("CREATE INDEX idx_daily_card_draw_date ON daily_card(draw_date);")
+
+    op.execute("""
+    INSERT INTO daily_card (id, user_id, card_key, draw_date)
+    SELECT id, user_id, card_key, draw_date FROM daily_card_partitioned;
+    """)
+    op.execute("DROP TABLE daily_card_partitioned;")
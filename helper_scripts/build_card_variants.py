@@ -0,0 +1,185 @@
+"""
+Offline build stage for responsive card images.
+
+Renders every card image in the source folder into several widths and formats and
+uploads them to the bucket under a predictable naming scheme:
+
+    variants/{card key}/{width}.{format}      e.g. variants/fool/640.webp
+    variants/manifest.json                    the list of variants per card
+
+The backend reads the manifest and returns the variants (with dimensions) as a srcset
+with each drawn card. Cards are never upscaled: widths larger than the source are skipped.
+Unchanged variants are not rendered again (output newer than its source) and not uploaded
+again (sync by ETag). Content-addressed copies are published as well (see sync_cards_to_minio.py).
+
+AVIF needs Pillow >= 11.2 or the pillow-avif-plugin package; without it, only WebP is built.
+
+Usage:
+    python build_card_variants.py [--source ./cards] [--output ./build/variants] [--widths 320,640,960] [--formats webp,avif]
+"""
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+from dotenv import load_dotenv
+from PIL import Image, features
+from sync_cards_to_minio import create_client, sync_folder, publish_hashed
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF codec on older Pillow versions)
+except ImportError:
+    pass
+
+# Load environment variables from a .env file (e.g., credentials, config settings)
+load_dotenv()
+
+# Object name prefix of all variants; the backend excludes it from the deck
+VARIANTS_PREFIX = "variants/"
+MANIFEST_NAME = "manifest.json"
+
+DEFAULT_WIDTHS = (320, 640, 960)
+DEFAULT_FORMATS = ("webp", "avif")
+
+# Encoder settings per format
+ENCODER_OPTIONS: Dict[str, Dict[str, Any]] = {
+    "webp": {"quality": 80, "method": 6},
+    "avif": {"quality": 60, "speed": 6},
+}
+
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+# Source files considered card images
+SOURCE_EXTENSIONS = (".webp", ".png", ".jpg", ".jpeg")
+
+def card_key(filename: str) -> str:
+    """Derives the card key from a file name, like the backend does (e.g., "Fool.webp" -> "fool")."""
+    return os.path.basename(filename).split(".")[0].lower()
+
+
+def avif_supported() -> bool:
+    """True if the installed Pillow (or pillow-avif-plugin) can encode AVIF."""
+    Image.init()
+    if "AVIF" not in Image.SAVE:
+        return False
+    # Pillow >= 11.2 registers the plugin even when built without libavif
+    return "avif" not in features.codecs or features.check_codec("avif")
+
+
+def supported_formats(formats: List[str]) -> List[str]:
+    """Drops formats the installed Pillow cannot encode."""
+    supported = []
+    for fmt in formats:
+        if fmt == "avif" and not avif_supported():
+            print("AVIF encoding is not available (install Pillow >= 11.2 or pillow-avif-plugin); skipping AVIF.")
+            continue
+        supported.append(fmt)
+    return supported
+
+
+def render_card(source_path: str, output_dir: str, key: str, widths: List[int], formats: List[str]) -> List[Dict[str, Any]]:
+    """
+    Renders one card into all widths and formats below output_dir/{key}/.
+
+    Returns:
+        List[Dict[str, Any]]: Manifest entries of the card's variants, smallest first.
+    """
+    entries = []
+    source_mtime = os.path.getmtime(source_path)
+    with Image.open(source_path) as source:
+        source.load()
+        image = source.convert("RGBA") if source.mode in ("P", "LA") else source
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGB")
+        card_dir = os.path.join(output_dir, key)
+        os.makedirs(card_dir, exist_ok=True)
+
+        for width in sorted(widths):
+            if width > image.width:
+                continue
+            height = round(image.height * width / image.width)
+            resized = None
+            for fmt in formats:
+                filename = f"{width}.{fmt}"
+                path = os.path.join(card_dir, filename)
+                if not (os.path.exists(path) and os.path.getmtime(path) >= source_mtime):
+                    if resized is None:
+                        resized = image.resize((width, height), Image.LANCZOS)
+                    resized.save(path, format=fmt.upper(), **ENCODER_OPTIONS.get(fmt, {}))
+                entries.append({
+                    "object_name": f"{VARIANTS_PREFIX}{key}/{filename}",
+                    "width": width,
+                    "height": height,
+                    "format": fmt,
+                    "content_type": CONTENT_TYPES[fmt],
+                    "size": os.path.getsize(path),
+                })
+    return entries
+
+
+def build_variants(source_dir: str, output_dir: str, widths: List[int], formats: List[str]) -> Dict[str, Any]:
+    """
+    Renders all cards of the source folder and writes the manifest to output_dir.
+
+    Returns:
+        Dict[str, Any]: The manifest: {"widths", "formats", "cards": {key: [variant, ...]}}.
+    """
+    formats = supported_formats(formats)
+    cards: Dict[str, List[Dict[str, Any]]] = {}
+    for filename in sorted(os.listdir(source_dir)):
+        path = os.path.join(source_dir, filename)
+        if not os.path.isfile(path) or not filename.lower().endswith(SOURCE_EXTENSIONS):
+            continue
+        key = card_key(filename)
+        try:
+            cards[key] = render_card(path, output_dir, key, widths, formats)
+            print(f"{key}: {len(cards[key])} variants.")
+        except Exception as e:
+            print(f"{filename}: rendering failed: {e}")
+
+    manifest = {"widths": sorted(widths), "formats": formats, "cards": cards}
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render responsive card image variants and upload them to MinIO.")
+    parser.add_argument("--source", default=os.getenv("MINIO_FOLDER_PATH", "./test"), help="Folder with the full-size card images")
+    parser.add_argument("--output", default="./build/variants", help="Local folder for the rendered variants")
+    parser.add_argument("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), help="Comma-separated widths in pixels")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS), help="Comma-separated formats (webp, avif)")
+    parser.add_argument("--bucket", default=os.getenv("MINIO_BUCKET_TAROT", "test"), help="Target bucket")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent uploads")
+    parser.add_argument("--no-upload", action="store_true", help="Only render, do not upload")
+    args = parser.parse_args()
+
+    widths = [int(width) for width in args.widths.split(",") if width.strip()]
+    formats = [fmt.strip().lower() for fmt in args.formats.split(",") if fmt.strip()]
+    os.makedirs(args.output, exist_ok=True)
+    manifest = build_variants(args.source, args.output, widths, formats)
+    print(f"Rendered variants of {len(manifest['cards'])} cards into {args.output}.")
+
+    if args.no_upload:
+        return
+
+    # Variants of removed cards are deleted; the manifest is uploaded with the variants
+    client = create_client()
+    result = sync_folder(
+        client,
+        args.bucket,
+        args.output,
+        prefix=VARIANTS_PREFIX,
+        workers=args.workers,
+        delete=True,
+    )
+    print(f"{len(result.uploaded)} variants uploaded, {len(result.unchanged)} unchanged, {len(result.deleted)} deleted.")
+
+    hashed = publish_hashed(client, args.bucket, args.output, prefix=VARIANTS_PREFIX, workers=args.workers)
+    print(f"{len(hashed.uploaded)} hashed copies uploaded, {len(hashed.unchanged)} already published.")
+    result.failed.update(hashed.failed)
+    if result.failed:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
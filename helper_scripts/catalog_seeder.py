@@ -0,0 +1,233 @@
+"""
+Bulk seeding engine for the card catalog ('cards' and 'card_translations').
+
+The multilanguage JSON file is parsed as a stream, one card object at a time, and
+spooled into CSV buffers: one for the card keys and one per language. Each buffer is
+loaded with COPY into a temporary staging table and merged into the real table with a
+single set-based INSERT ... SELECT ... ON CONFLICT statement:
+
+- The card keys are merged in one transaction, then each language bundle in its own
+  transaction. A failing language does not roll back the languages merged before it.
+- Rows whose name and description are already stored are filtered out before the insert.
+  Reseeding an unchanged catalog therefore writes no rows and generates no WAL for them.
+- Translations are only ever inserted or updated; rows missing from the file are kept.
+
+Usage from another helper script:
+
+    from catalog_seeder import seed_catalog
+    seed_catalog(conn, "card_descriptions_multilanguage_prod.json")
+"""
+import csv
+import json
+import tempfile
+from typing import IO, Any, Dict, Iterator
+
+# Bytes read from the JSON file at a time
+READ_CHUNK_SIZE = 64 * 1024
+
+# CSV buffers are kept in memory up to this size, then spill to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Characters that may follow an element of a JSON array
+ELEMENT_TERMINATORS = frozenset(" \t\r\n,]")
+
+MERGE_CARDS_QUERY = """
+    INSERT INTO cards (key)
+    SELECT DISTINCT s.key
+    FROM staging_cards s
+    WHERE NOT EXISTS (SELECT 1 FROM cards c WHERE c.key = s.key)
+    ON CONFLICT (key) DO NOTHING
+"""
+
+# The last occurrence of a (key, lang) pair in the file wins. Unchanged rows are
+# filtered out in the SELECT, so they are neither updated nor locked.
+MERGE_TRANSLATIONS_QUERY = """
+    INSERT INTO card_translations (card_id, lang, name, description)
+    SELECT c.id, s.lang, s.name, s.description
+    FROM (
+        SELECT DISTINCT ON (key, lang) key, lang, name, description
+        FROM staging_translations
+        ORDER BY key, lang, seq DESC
+    ) s
+    JOIN cards c ON c.key = s.key
+    LEFT JOIN card_translations t ON t.card_id = c.id AND t.lang = s.lang
+    WHERE t.id IS NULL
+       OR (t.name, t.description) IS DISTINCT FROM (s.name, s.description)
+    ON CONFLICT (card_id, lang) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = EXCLUDED.description
+"""
+
+
+def iter_json_array(file: IO[str], chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array one by one, without loading the whole
+    document into memory. Each element is decoded with json.JSONDecoder.raw_decode as soon
+    as it is complete in the read buffer.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a JSON array or is malformed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def skip_whitespace() -> str:
+        # Returns the next non-whitespace character (without consuming it), or "" at the end
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if eof or not fill():
+                return ""
+
+    if skip_whitespace() != "[":
+        raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+    position += 1
+
+    if skip_whitespace() == "]":
+        return
+
+    while True:
+        skip_whitespace()
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The element may continue in the next chunk
+                if eof or not fill():
+                    raise
+                continue
+            # A number cut at the end of the buffer decodes as a shorter number ("1." of "1.5");
+            # an element is complete only once the character after it is in the buffer
+            if not eof and (end == len(buffer) or buffer[end] not in ELEMENT_TERMINATORS) and fill():
+                continue
+            break
+        position = end
+        yield element
+
+        separator = skip_whitespace()
+        if separator == ",":
+            position += 1
+        elif separator == "]":
+            return
+        else:
+            raise json.JSONDecodeError("Expected ',' or ']' in JSON array", buffer, position)
+
+
+def new_spool() -> IO[str]:
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, mode="w+", encoding="utf-8", newline="")
+
+
+def spool_catalog(file: IO[str]):
+    """
+    Reads the catalog JSON and writes the card keys and the per-language translations
+    into CSV spools, ready for COPY.
+
+    Returns:
+        Tuple[IO[str], Dict[str, IO[str]]]: The card key spool and one translation spool per language.
+    """
+    cards = new_spool()
+    card_writer = csv.writer(cards)
+    languages: Dict[str, IO[str]] = {}
+    writers: Dict[str, Any] = {}
+
+    for seq, card in enumerate(iter_json_array(file)):
+        key = card["key"]
+        card_writer.writerow((key,))
+        for lang, translation in card.get("translations", {}).items():
+            if lang not in writers:
+                languages[lang] = new_spool()
+                writers[lang] = csv.writer(languages[lang])
+            writers[lang].writerow((
+                seq,
+                key,
+                lang,
+                translation.get("name", ""),
+                translation.get("description", ""),
+            ))
+
+    return cards, languages
+
+
+def copy_into(cur, table: str, columns: str, spool: IO[str], not_null: str = ""):
+    """
+    Streams a CSV spool into a table with COPY.
+
+    In CSV format COPY reads an unquoted empty field as NULL; the 'not_null' columns
+    read it as an empty string instead (FORCE_NOT_NULL).
+    """
+    spool.seek(0)
+    options = f"FORMAT csv, FORCE_NOT_NULL ({not_null})" if not_null else "FORMAT csv"
+    cur.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH ({options})", spool)
+
+
+def seed_catalog(conn, json_path: str) -> Dict[str, int]:
+    """
+    Seeds 'cards' and 'card_translations' from the multilanguage JSON file.
+
+    Args:
+        conn: An open psycopg2 connection. Pending work on it is committed first.
+        json_path (str): Path of the JSON file (a list of {"key", "translations": {lang: {...}}}).
+
+    Returns:
+        Dict[str, int]: Number of inserted or changed rows: "cards" plus one entry per language.
+    """
+    conn.commit()
+    with open(json_path, encoding="utf-8") as f:
+        cards, languages = spool_catalog(f)
+
+    results: Dict[str, int] = {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE staging_cards (key TEXT NOT NULL) ON COMMIT DROP")
+            copy_into(cur, "staging_cards", "key", cards)
+            cur.execute(MERGE_CARDS_QUERY)
+            results["cards"] = cur.rowcount
+        conn.commit()
+
+        for lang in sorted(languages):
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        CREATE TEMP TABLE staging_translations (
+                            seq INTEGER NOT NULL,
+                            key TEXT NOT NULL,
+                            lang TEXT NOT NULL,
+                            name TEXT NOT NULL,
+                            description TEXT NOT NULL
+                        ) ON COMMIT DROP
+                    """)
+                    copy_into(
+                        cur,
+                        "staging_translations",
+                        "seq, key, lang, name, description",
+                        languages[lang],
+                        not_null="name, description",
+                    )
+                    cur.execute(MERGE_TRANSLATIONS_QUERY)
+                    results[lang] = cur.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                print(f"Seeding translations for language '{lang}' failed; other languages are kept.")
+                raise
+    finally:
+        cards.close()
+        for spool in languages.values():
+            spool.close()
+
+    return results
@@ -1,41 +1,25 @@
 import os
-from minio import Minio
 from dotenv import load_dotenv
+from sync_cards_to_minio import create_client, sync_folder, publish_hashed, HASHED_PREFIX
 
 # Load environment variables from a .env file (e.g., credentials, config settings)
 load_dotenv()
 
 # Initialize the MinIO client with credentials from environment variables or fallback defaults
-client = Minio(
-    endpoint = os.getenv("MINIO_ENDPOINT", "localhost:9000"),  # Address of the MinIO server
-    access_key = os.getenv("MINIO_ROOT_USER", "test"),  # Access key (default: 'test' if not set)
-    secret_key = os.getenv("MINIO_ROOT_PASSWORD", "test"),  # Secret key (default: 'test' if not set)
-    secure = False  # Use HTTP instead of HTTPS
-)
+client = create_client(endpoint=os.getenv("MINIO_ENDPOINT", "localhost:9000"))
 
 bucket_name = os.getenv("MINIO_BUCKET_TAROT", "test")
 
-# Check if the specified bucket exists, and create it if it does not
-if not client.bucket_exists(bucket_name):
-    client.make_bucket(bucket_name)
-
 # Path to the local folder containing files to upload
 folder_path = os.getenv("MINIO_FOLDER_PATH", "./test")
 
-# Iterate through each file in the folder
-for filename in os.listdir(folder_path):
-    file_path = os.path.join(folder_path, filename)
-
-    # Ensure that we only attempt to upload actual files, not directories
-    if os.path.isfile(file_path):
-        # Determine the correct content type (MIME type) based on the file extension
-        content_type = "image/png" if filename.lower().endswith(".png") else "application/octet-stream"
+# Upload new and changed files only (compared by size and ETag), several at a time.
+# The bucket is created if it does not exist. See sync_cards_to_minio.py for more options
+# (e.g., --delete to remove objects that no longer exist locally).
+result = sync_folder(client, bucket_name, folder_path)
+print(f"{len(result.uploaded)} files uploaded, {len(result.unchanged)} unchanged, {len(result.failed)} failed.")
 
-        # Upload the file to the specified MinIO bucket
-        client.fput_object(
-            bucket_name,
-            filename,         # Object name in the bucket (same as the file name)
-            file_path,        # Local path to the file
-            content_type=content_type  # MIME type for the uploaded object
-        )
-        print(f"{filename} Uploaded...")  # Log the uploaded file name in Hungarian
+# Publish content-addressed copies (hashed/) and the manifest the backend builds image URLs from.
+# Variants are published by build_card_variants.py and keep their manifest entries.
+hashed = publish_hashed(client, bucket_name, folder_path, exclude_prefixes=("variants/", HASHED_PREFIX))
+print(f"{len(hashed.uploaded)} hashed copies uploaded, {len(hashed.unchanged)} already published, {len(hashed.failed)} failed.")
@@ -3,6 +3,7 @@ import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 import json
 from dotenv import load_dotenv
+from catalog_seeder import seed_catalog
 
 # Load environment variables from .env file.
 load_dotenv()
@@ -126,60 +127,87 @@ def create_tables_and_insert_data():
         """)
 
         # Create 'daily_card' table if it does not exist.
-        # Stores the daily card drawn by each user.
+        # Stores the daily card drawn by each user, range-partitioned by month of draw_date.
+        # The backend creates upcoming partitions and retires old ones (services/database/partitions.py).
         cur.execute("""
         CREATE TABLE IF NOT EXISTS daily_card (
-            id SERIAL PRIMARY KEY,
+            id SERIAL,
             user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, -- Foreign key to users table
             card_key VARCHAR(100) NOT NULL REFERENCES cards(key) ON DELETE RESTRICT, -- Foreign key to cards table
-            draw_date DATE NOT NULL DEFAULT CURRENT_DATE -- Date the card was drawn
+            draw_date DATE NOT NULL DEFAULT CURRENT_DATE, -- Date the card was drawn
+            PRIMARY KEY (id, draw_date) -- Must include the partition key
+        ) PARTITION BY RANGE (draw_date);
+        """)
+
+        # Create partitions for the current and the next three months.
+        cur.execute("""
+        DO $$
+        DECLARE
+            month DATE := date_trunc('month', CURRENT_DATE)::date;
+        BEGIN
+            WHILE month <= (date_trunc('month', CURRENT_DATE) + interval '3 months')::date LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF daily_card FOR VALUES FROM (%L) TO (%L)',
+                    'daily_card_' || to_char(month, '"y"YYYY"m"MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END
+        $$;
+        """)
+
+        # Create 'refresh_sessions' table if it does not exist.
+        # One row per login/device; only the SHA-256 hash of the refresh token is stored,
+        # so token lookups are primary-key lookups and a database leak exposes no usable tokens.
+        cur.execute("""
+        CREATE TABLE IF NOT EXISTS refresh_sessions (
+            token_hash BYTEA PRIMARY KEY CHECK (octet_length(token_hash) = 32), -- SHA-256 of the refresh token
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE, -- Foreign key to users table
+            device VARCHAR(255), -- Client description (User-Agent)
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT NOW(),
+            expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
         );
         """)
 
         # Create indexes for performance optimization on frequently queried columns.
+        # Keep in sync with alembic/versions, which brings existing databases up to date.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_refresh_sessions_expires_at ON refresh_sessions(expires_at);")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_refresh_sessions_user_id ON refresh_sessions(user_id);")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_users_sub ON users(sub);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_daily_card_user_id ON daily_card(user_id);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_daily_card_draw_date ON daily_card(draw_date);")
-
-        # Read card data from the JSON file.
-        with open(json_file_path, encoding="utf-8") as f:
-            cards_data = json.load(f)
-
-        # Iterate through each card in the JSON data.
-        for card in cards_data:
-            key = card["key"]
-
-            # Insert the card key into the 'cards' table if it doesn't already exist.
-            # ON CONFLICT (key) DO NOTHING prevents errors if the key is already present.
-            cur.execute("""
-                INSERT INTO cards (key)
-                VALUES (%s)
-                ON CONFLICT (key) DO NOTHING;
-            """, (key,))
-            # Retrieve the generated 'id' for the card.
-            cur.execute("SELECT id FROM cards WHERE key = %s;", (key,))
-            card_id = cur.fetchone()[0]
-
-            # Process translations for the current card.
-            translations = card.get("translations", {})
-            for lang, trans in translations.items():
-                name = trans.get("name", "")
-                description = trans.get("description", "")
-
-                # Insert or update card translations.
-                # ON CONFLICT (card_id, lang) DO UPDATE SET updates
-                # the name and description if a translation for the same card
-                # and language already exists.
-                cur.execute("""
-                    INSERT INTO card_translations (card_id, lang, name, description)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (card_id, lang) DO UPDATE SET
-                        name = EXCLUDED.name,
-                        description = EXCLUDED.description;
-                """, (card_id, lang, name, description))
-
-        # Commit the transaction to save the changes to the database.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_daily_card_user_id_draw_date ON daily_card(user_id, draw_date);")
+        cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_card_translations_card_id_lang_covering
+        ON card_translations(card_id, lang) INCLUDE (name, description);
+        """)
+
+        # Notify running backends whenever the catalog tables change.
+        # Statement-level triggers send one NOTIFY per statement; Postgres delivers it on commit
+        # and folds duplicates within a transaction, so a full reseed wakes each worker once.
+        cur.execute("""
+        CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('catalog_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+        for table in ("cards", "card_translations"):
+            cur.execute(f"DROP TRIGGER IF EXISTS {table}_notify_catalog_change ON {table};")
+            cur.execute(f"""
+            CREATE TRIGGER {table}_notify_catalog_change
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+            """)
+
+        # Commit the schema, then bulk-load cards and translations from the JSON file:
+        # COPY into staging tables and a set-based merge, one transaction per language.
+        # Unchanged rows are skipped, so reseeding an unchanged catalog writes nothing.
         conn.commit()
+        changed = seed_catalog(conn, json_file_path)
+        for table, count in changed.items():
+            print(f"Seeded {table}: {count} rows inserted or updated.")
 
         # Optional: Print the data from the 'cards' and 'card_translations' tables
         # to verify insertion.
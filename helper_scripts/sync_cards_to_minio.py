@@ -0,0 +1,410 @@
+"""
+Incremental, parallel sync of a local card image folder to a MinIO bucket.
+
+The folder is compared with the bucket by size and ETag. Only new or changed files are
+uploaded, through a pool of worker threads; files larger than PART_SIZE are uploaded in
+parts. Objects get a content type derived from the file extension and a Cache-Control
+header. Objects that no longer exist locally are deleted only with --delete.
+
+MinIO reports the MD5 of the content as the ETag of a single-part upload, and
+md5(part MD5s) + "-<parts>" for a multipart upload. The local ETag is computed the same
+way with the same part size, so unchanged files are recognized without downloading them.
+
+Every file is also published under a content-addressed name below hashed/ (e.g.,
+hashed/fool.3f2a9c1b7d0e4a11.webp) with an immutable Cache-Control, and hashed/manifest.json
+maps the plain object names to them. The backend links the hashed names, so a changed image
+gets a new URL and browsers never need to revalidate. Hashed objects are never overwritten
+or deleted: their content cannot change, and pages rendered earlier may still link them.
+
+Usage:
+    python sync_cards_to_minio.py [--folder ./cards] [--prefix ""] [--workers 8] [--delete] [--dry-run] [--no-hashed]
+"""
+import argparse
+import hashlib
+import io
+import json
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from minio import Minio
+from minio.deleteobjects import DeleteObject
+from minio.error import S3Error
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file (e.g., credentials, config settings)
+load_dotenv()
+
+# Files up to this size are uploaded in one request; larger files in parts of this size.
+# MinIO requires parts of at least 5 MiB.
+PART_SIZE = 8 * 1024 * 1024
+
+# Block size used when hashing files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Cache-Control stored with every uploaded object
+DEFAULT_CACHE_CONTROL = os.getenv("MINIO_CACHE_CONTROL", "public, max-age=86400")
+
+# Content-addressed copies and the manifest mapping plain object names to them
+HASHED_PREFIX = "hashed/"
+HASHED_MANIFEST = f"{HASHED_PREFIX}manifest.json"
+HASHED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Hex digits of the SHA-256 content hash kept in hashed object names
+HASH_LENGTH = 16
+
+# Image types the frontend uses that older mimetypes tables do not know
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+
+@dataclass
+class LocalFile:
+    path: str
+    size: int
+    etag: str
+
+
+@dataclass
+class SyncResult:
+    uploaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+def create_client(endpoint: Optional[str] = None) -> Minio:
+    """Creates a MinIO client from the environment (same variables as the other helper scripts)."""
+    return Minio(
+        endpoint=endpoint or os.getenv("MINIO_ENDPOINT_HELPER_SCRIPTS", "localhost:9000"),
+        access_key=os.getenv("MINIO_ROOT_USER", "test"),
+        secret_key=os.getenv("MINIO_ROOT_PASSWORD", "test"),
+        secure=False
+    )
+
+
+def content_type_for(filename: str) -> str:
+    """Returns the MIME type of a file by its extension, application/octet-stream if unknown."""
+    content_type, _ = mimetypes.guess_type(filename)
+    return content_type or "application/octet-stream"
+
+
+def compute_etag(path: str, size: int, part_size: int = PART_SIZE) -> str:
+    """
+    Computes the ETag MinIO assigns when the file is uploaded with the given part size.
+    """
+    if size <= part_size:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    part_digests = []
+    with open(path, "rb") as f:
+        while True:
+            part = f.read(part_size)
+            if not part:
+                break
+            part_digests.append(hashlib.md5(part).digest())
+    return f"{hashlib.md5(b''.join(part_digests)).hexdigest()}-{len(part_digests)}"
+
+
+def content_hash(path: str) -> str:
+    """Returns the truncated SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def hashed_object_name(name: str, digest: str) -> str:
+    """
+    Returns the content-addressed name of an object, with the hash before the extension
+    (e.g., "variants/fool/640.webp" -> "hashed/variants/fool/640.<hash>.webp").
+    """
+    directory, _, filename = name.rpartition("/")
+    stem, dot, extension = filename.rpartition(".")
+    hashed = f"{stem}.{digest}.{extension}" if dot else f"{filename}.{digest}"
+    return f"{HASHED_PREFIX}{directory}/{hashed}" if directory else f"{HASHED_PREFIX}{hashed}"
+
+
+def scan_folder(folder: str, prefix: str = "") -> Dict[str, LocalFile]:
+    """
+    Lists the files below a folder (hidden files excluded), keyed by object name:
+    the prefix plus the path relative to the folder, with '/' separators.
+    """
+    files: Dict[str, LocalFile] = {}
+    for root, dirs, names in os.walk(folder):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in names:
+            if name.startswith("."):
+                continue
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, folder).replace(os.sep, "/")
+            size = os.path.getsize(path)
+            files[prefix + relative] = LocalFile(path=path, size=size, etag="")
+    return files
+
+
+def list_remote(client: Minio, bucket: str, prefix: str = "") -> Dict[str, Tuple[int, str]]:
+    """Returns {object name: (size, etag)} for the objects below the prefix."""
+    return {
+        obj.object_name: (obj.size, (obj.etag or "").strip('"'))
+        for obj in client.list_objects(bucket, prefix=prefix or None, recursive=True)
+        if not obj.is_dir
+    }
+
+
+def plan_uploads(local: Dict[str, LocalFile], remote: Dict[str, Tuple[int, str]], force: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    Splits the local files into (to upload, unchanged). Files whose size differs from the
+    remote object are uploaded without hashing; equal sizes are compared by ETag.
+    """
+    upload, unchanged = [], []
+    for name, file in sorted(local.items()):
+        existing = remote.get(name)
+        if force or existing is None or existing[0] != file.size:
+            upload.append(name)
+            continue
+        file.etag = compute_etag(file.path, file.size)
+        if file.etag == existing[1]:
+            unchanged.append(name)
+        else:
+            upload.append(name)
+    return upload, unchanged
+
+
+def upload_file(client: Minio, bucket: str, name: str, file: LocalFile, cache_control: str):
+    client.fput_object(
+        bucket,
+        name,
+        file.path,
+        content_type=content_type_for(name),
+        metadata={"Cache-Control": cache_control},
+        part_size=PART_SIZE,
+    )
+
+
+def load_hashed_manifest(client: Minio, bucket: str) -> Dict[str, str]:
+    """Returns the published {object name: hashed object name} mapping, empty if there is none yet."""
+    try:
+        response = client.get_object(bucket, HASHED_MANIFEST)
+    except S3Error as e:
+        if e.code == "NoSuchKey":
+            return {}
+        raise
+    try:
+        return json.loads(response.read()).get("objects", {})
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def publish_hashed(
+    client: Minio,
+    bucket: str,
+    folder: str,
+    prefix: str = "",
+    workers: int = 8,
+    dry_run: bool = False,
+    exclude_prefixes: Tuple[str, ...] = (),
+) -> SyncResult:
+    """
+    Uploads content-addressed copies of the folder's files and updates the hashed manifest.
+
+    The manifest entries below 'prefix' are replaced by the folder's files; entries below
+    exclude_prefixes (published by other tools) are kept. A file whose upload fails keeps
+    its previous entry. Runs publishing to the same bucket must not overlap.
+
+    Returns:
+        SyncResult: Uploaded, unchanged (already published) and failed object names (plain names).
+    """
+    result = SyncResult()
+    exists = client.bucket_exists(bucket)
+    if not exists and not dry_run:
+        client.make_bucket(bucket)
+
+    local = scan_folder(folder, prefix)
+    hashed = {name: hashed_object_name(name, content_hash(file.path)) for name, file in local.items()}
+    published = set(list_remote(client, bucket, HASHED_PREFIX)) if exists else set()
+    upload = sorted(name for name in local if hashed[name] not in published)
+    result.unchanged = sorted(name for name in local if hashed[name] in published)
+
+    if dry_run:
+        result.uploaded = upload
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(upload_file, client, bucket, hashed[name], local[name], HASHED_CACHE_CONTROL): name
+            for name in upload
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                result.uploaded.append(name)
+                print(f"{hashed[name]} uploaded.")
+            except Exception as e:
+                result.failed[name] = str(e)
+                print(f"{hashed[name]} upload failed: {e}")
+
+    previous = load_hashed_manifest(client, bucket) if exists else {}
+    objects = {
+        name: target for name, target in previous.items()
+        if not name.startswith(prefix) or name.startswith(exclude_prefixes)
+    }
+    for name in local:
+        if name not in result.failed:
+            objects[name] = hashed[name]
+        elif name in previous:
+            objects[name] = previous[name]
+    if exists and objects == previous:
+        return result
+
+    data = json.dumps({"objects": objects}, indent=2, sort_keys=True).encode("utf-8")
+    client.put_object(
+        bucket,
+        HASHED_MANIFEST,
+        io.BytesIO(data),
+        len(data),
+        content_type="application/json",
+        metadata={"Cache-Control": "no-cache"},
+    )
+    return result
+
+
+def sync_folder(
+    client: Minio,
+    bucket: str,
+    folder: str,
+    prefix: str = "",
+    workers: int = 8,
+    delete: bool = False,
+    dry_run: bool = False,
+    force: bool = False,
+    cache_control: str = DEFAULT_CACHE_CONTROL,
+    exclude_prefixes: Tuple[str, ...] = (),
+) -> SyncResult:
+    """
+    Makes the bucket (below 'prefix') match the local folder.
+
+    Args:
+        client (Minio): MinIO client.
+        bucket (str): Target bucket; created if missing.
+        folder (str): Local folder to upload.
+        prefix (str): Object name prefix.
+        workers (int): Number of concurrent uploads.
+        delete (bool): Delete objects below the prefix that do not exist locally.
+        dry_run (bool): Only report what would change.
+        force (bool): Upload every file, e.g., to apply a new Cache-Control.
+        cache_control (str): Cache-Control stored with uploaded objects.
+        exclude_prefixes (Tuple[str, ...]): Object name prefixes managed by other tools;
+            they are never deleted as orphans.
+
+    Returns:
+        SyncResult: Uploaded, unchanged, deleted and failed object names.
+    """
+    result = SyncResult()
+    exists = client.bucket_exists(bucket)
+    if not exists and not dry_run:
+        client.make_bucket(bucket)
+
+    local = scan_folder(folder, prefix)
+    remote = list_remote(client, bucket, prefix) if exists else {}
+    upload, result.unchanged = plan_uploads(local, remote, force)
+
+    if dry_run:
+        result.uploaded = upload
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(upload_file, client, bucket, name, local[name], cache_control): name
+                for name in upload
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                    result.uploaded.append(name)
+                    print(f"{name} uploaded.")
+                except Exception as e:
+                    result.failed[name] = str(e)
+                    print(f"{name} upload failed: {e}")
+
+    if delete:
+        orphans = sorted(
+            name for name in remote
+            if name not in local and not name.startswith(exclude_prefixes)
+        )
+        if dry_run:
+            result.deleted = orphans
+        elif orphans:
+            errors = client.remove_objects(bucket, (DeleteObject(name) for name in orphans))
+            failed = {error.name: error.message for error in errors}
+            result.failed.update(failed)
+            result.deleted = [name for name in orphans if name not in failed]
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync a local card image folder to a MinIO bucket.")
+    parser.add_argument("--folder", default=os.getenv("MINIO_FOLDER_PATH", "./test"), help="Local folder to upload")
+    parser.add_argument("--bucket", default=os.getenv("MINIO_BUCKET_TAROT", "test"), help="Target bucket")
+    parser.add_argument("--endpoint", default=None, help="MinIO endpoint (default: MINIO_ENDPOINT_HELPER_SCRIPTS)")
+    parser.add_argument("--prefix", default="", help="Object name prefix")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent uploads")
+    parser.add_argument("--cache-control", default=DEFAULT_CACHE_CONTROL, help="Cache-Control of uploaded objects")
+    parser.add_argument("--delete", action="store_true", help="Delete objects that do not exist locally")
+    parser.add_argument("--force", action="store_true", help="Upload all files, even unchanged ones")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would change")
+    parser.add_argument("--no-hashed", action="store_true", help="Do not publish content-addressed copies")
+    parser.add_argument(
+        "--exclude-prefix",
+        action="append",
+        default=["variants/", HASHED_PREFIX],
+        help="Object prefix never deleted as an orphan (default: variants/ and hashed/, managed by other tools)",
+    )
+    args = parser.parse_args()
+
+    result = sync_folder(
+        create_client(args.endpoint),
+        args.bucket,
+        args.folder,
+        prefix=args.prefix,
+        workers=args.workers,
+        delete=args.delete,
+        dry_run=args.dry_run,
+        force=args.force,
+        cache_control=args.cache_control,
+        exclude_prefixes=tuple(args.exclude_prefix),
+    )
+    action = "would be" if args.dry_run else "were"
+    print(
+        f"{len(result.uploaded)} objects {action} uploaded, {len(result.unchanged)} unchanged, "
+        f"{len(result.deleted)} {action} deleted, {len(result.failed)} failed."
+    )
+
+    if not args.no_hashed:
+        hashed = publish_hashed(
+            create_client(args.endpoint),
+            args.bucket,
+            args.folder,
+            prefix=args.prefix,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            exclude_prefixes=tuple(args.exclude_prefix),
+        )
+        print(f"{len(hashed.uploaded)} hashed copies {action} uploaded, {len(hashed.unchanged)} already published.")
+        result.failed.update(hashed.failed)
+
+    if result.failed:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()